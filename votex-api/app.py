@@ -1,21 +1,47 @@
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
 from routes.election_routes import election_bp
 from routes.auth_routes import auth_bp
-from routes.vote_routes import vote_bp
+from routes.vote_routes import vote_bp, PAGE_TEMPLATES
+from utils.data import restore_state, startup_stats, response_cache, fragment_cache, integrity_monitor
+from utils.data import JSON_ENCODER, COMPRESSION, response_compressor, otp_store
+from utils.json_provider import FastJSONProvider
 
 def create_app():
     app = Flask(__name__)
+    app.json = FastJSONProvider(app, JSON_ENCODER)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
     
+    # Restore state from the latest snapshot and replay newer blocks
+    restore_state()
+    
+    # Verify the chain in the background; pages read the cached status
+    integrity_monitor.start()
+    
     # Register blueprints
     app.register_blueprint(election_bp, url_prefix='/api')
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(vote_bp, url_prefix='/api')
     
+    # Compress complete response bodies for clients that accept it
+    if COMPRESSION:
+        app.after_request(lambda response: response_compressor(request, response))
+    
+    # Compile the page templates once instead of on every request
+    app.extensions['votex_templates'] = {name: app.jinja_env.get_template(name) for name in PAGE_TEMPLATES}
+    
     @app.route('/api/health', methods=['GET'])
     def health_check():
-        return {"status": "healthy", "service": "Votex API"}
+        return {
+            "status": "healthy",
+            "service": "Votex API",
+            "startup": startup_stats,
+            "response_cache": response_cache.stats(),
+            "fragment_cache": fragment_cache.stats(),
+            "json_encoder": app.json.encoder,
+            "compression": response_compressor.stats() if COMPRESSION else None,
+            "otp": otp_store.stats()
+        }
     
     return app
 
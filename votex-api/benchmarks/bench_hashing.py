@@ -0,0 +1,74 @@
+"""
+Compare the legacy str()-based hashing with the canonical encoding layer
+
+Usage: python benchmarks/bench_hashing.py [num_transactions]
+"""
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.blockchain import MerkleTree
+from utils.encoding import hash_block
+
+
+def legacy_merkle_root(transactions):
+    """Merkle root as computed before the canonical encoding layer"""
+    def h(data):
+        return hashlib.sha256(data.encode()).hexdigest()
+    level = [h(str(tx)) for tx in transactions] or [h("empty_tree")]
+    while len(level) > 1:
+        level = [h(level[i] + level[i + 1 if i + 1 < len(level) else i]) for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def legacy_hash_block(block):
+    """Block hash as computed before the canonical encoding layer"""
+    return hashlib.sha256(str(block).encode()).hexdigest()
+
+
+def timed(label, fn, repeat=5):
+    best = min(_run(fn) for _ in range(repeat))
+    print(f"{label:<32} {best * 1000:10.3f} ms")
+    return best
+
+
+def _run(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    num_transactions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    transactions = [
+        {"voter_id": f"V{i:08d}", "election_id": 1 + i % 3, "candidate_id": 101 + i % 3, "timestamp": 1735689600.0 + i}
+        for i in range(num_transactions)
+    ]
+    block = {
+        'index': 1,
+        'timestamp': time.time(),
+        'transactions': transactions,
+        'merkle_root': MerkleTree(transactions).get_root(),
+        'previous_hash': '0' * 64,
+        'nonce': 0
+    }
+
+    print(f"{num_transactions} transactions per block")
+    legacy = timed("merkle root (str)", lambda: legacy_merkle_root(transactions))
+    canonical = timed("merkle root (canonical)", lambda: MerkleTree(transactions).get_root())
+    print(f"{'speedup':<32} {legacy / canonical:10.2f} x")
+    legacy = timed("block hash (str)", lambda: legacy_hash_block(block))
+    canonical = timed("block hash (canonical)", lambda: hash_block(block))
+    print(f"{'speedup':<32} {legacy / canonical:10.2f} x")
+    # The binary header commits to the transactions through the Merkle root,
+    # so validating a block means recomputing both
+    legacy = timed("validate block (str)", lambda: (legacy_merkle_root(transactions), legacy_hash_block(block)))
+    canonical = timed("validate block (canonical)", lambda: (MerkleTree(transactions).get_root(), hash_block(block)))
+    print(f"{'speedup':<32} {legacy / canonical:10.2f} x")
+
+
+if __name__ == "__main__":
+    main()
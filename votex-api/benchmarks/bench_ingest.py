@@ -0,0 +1,48 @@
+"""
+Measure vote ingestion throughput with many request threads voting at once
+
+Each thread queues its votes without waiting and then waits on the receipts,
+so the number reflects the writer rather than the block latency a single
+blocking request sees (VOTEX_BLOCK_MAX_LATENCY)
+
+Usage: python benchmarks/bench_ingest.py [num_votes] [num_threads]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import data
+
+
+def main():
+    num_votes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    data.storage.voters.add_many((f"B{i:09d}", f"Voter {i}", f"{9000000000 + i}") for i in range(num_votes))
+    height = len(data.blockchain.chain)
+
+    def vote(offset):
+        receipts = [data.record_vote(f"B{i:09d}", 1, 1 + i % 3, wait=False)
+                    for i in range(offset, num_votes, num_threads)]
+        for receipt in receipts:
+            receipt.result()
+
+    threads = [threading.Thread(target=vote, args=(offset,)) for offset in range(num_threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    sealed = len(data.blockchain.chain) - height
+    print(f"{num_votes} votes from {num_threads} threads in {seconds:.2f}s")
+    print(f"  throughput: {num_votes / seconds:10.0f} votes/sec")
+    print(f"  blocks:     {sealed:10d} ({num_votes / max(sealed, 1):.1f} votes/block)")
+    print(f"  tally:      {data.tally_engine.total(1)} votes counted, chain valid: {data.blockchain.is_chain_valid(full=True)}")
+
+
+if __name__ == "__main__":
+    main()
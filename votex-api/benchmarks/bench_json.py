@@ -0,0 +1,97 @@
+"""
+Compare the JSON encoders and response compression on ledger payloads
+
+Usage: python benchmarks/bench_json.py [votes_per_page]
+"""
+import gzip
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from utils.compression import brotli
+from utils.json_provider import FastJSONProvider, orjson
+
+
+def timed(label, fn, repeat=5):
+    best = min(_run(fn) for _ in range(repeat))
+    print(f"{label:<40} {best * 1000:10.2f} ms")
+    return best
+
+
+def _run(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def votes_page(num_votes):
+    """A page of /api/blockchain/votes as formatted by the vote view"""
+    votes = []
+    for i in range(num_votes):
+        block_index = 1 + i // 100
+        block_hash = hashlib.sha256(b"block %d" % block_index).hexdigest()
+        voter_id = f"V{i:08d}"
+        votes.append({
+            "voter_id": voter_id,
+            "voter_name": f"Voter {i}",
+            "voter_id_hash": hash(voter_id),
+            "timestamp": 1735689600.0 + i,
+            "election_id": 1 + i % 3,
+            "election_name": "General Election 2025",
+            "candidate_id": 101 + i % 3,
+            "candidate_name": "Candidate Name",
+            "block_hash": block_hash,
+            "block_index": block_index,
+            "tx_index": i % 100,
+            "merkle_root": hashlib.sha256(block_hash.encode()).hexdigest(),
+            "has_merkle_proof": True
+        })
+    return {
+        "votes": votes,
+        "next_cursor": "MTAwMDox",
+        "limit": num_votes,
+        "total_votes": num_votes * 10
+    }
+
+
+def batch_body(num_votes):
+    """Request body of /api/votes/batch"""
+    return {"votes": [
+        {"voter_id": f"V{i:08d}", "election_id": 1 + i % 3, "candidate_id": 101 + i % 3} for i in range(num_votes)
+    ]}
+
+
+def main():
+    num_votes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    app = Flask(__name__)
+    stdlib = FastJSONProvider(app, "stdlib")
+    fast = FastJSONProvider(app, "auto")
+    document = {"success": True, "data": votes_page(num_votes)}
+    body = stdlib.dumps_bytes(batch_body(num_votes))
+
+    print(f"{num_votes} votes per page, {len(stdlib.dumps_bytes(document)) / 1024:.1f} KiB of JSON")
+    if orjson is None:
+        print("orjson is not installed; the fast provider falls back to the standard library")
+    baseline = timed("dumps (stdlib)", lambda: stdlib.dumps_bytes(document))
+    best = timed(f"dumps ({fast.encoder})", lambda: fast.dumps_bytes(document))
+    print(f"{'speedup':<40} {baseline / best:10.2f} x")
+    baseline = timed("loads batch body (stdlib)", lambda: stdlib.loads(body))
+    best = timed(f"loads batch body ({fast.encoder})", lambda: fast.loads(body))
+    print(f"{'speedup':<40} {baseline / best:10.2f} x")
+
+    payload = fast.dumps_bytes(document)
+    compressors = [("gzip", lambda: gzip.compress(payload, compresslevel=6))]
+    if brotli is not None:
+        compressors.append(("brotli", lambda: brotli.compress(payload, quality=5)))
+    for name, compress in compressors:
+        timed(f"compress ({name})", compress)
+        print(f"{'  size':<40} {len(compress()) / 1024:10.1f} KiB of {len(payload) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
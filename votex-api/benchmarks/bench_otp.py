@@ -0,0 +1,65 @@
+"""
+Measure OTP store issuance and verification throughput and its memory bound under a request flood
+
+Usage: python benchmarks/bench_otp.py [num_voters]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.otp_store import OTPStore, OTP_VALID
+
+
+def rate(label, count, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {count / elapsed:12.0f} ops/sec")
+
+
+def main():
+    num_voters = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    voter_ids = [f"V{i:09d}" for i in range(num_voters)]
+
+    store = OTPStore(ttl=300, max_entries=num_voters)
+    rate("issue", num_voters, lambda: [store.issue(voter_id, 1000 + i % 9000) for i, voter_id in enumerate(voter_ids)])
+    rate("verify (wrong code)", num_voters, lambda: [store.verify(voter_id, 0) for voter_id in voter_ids])
+    valid = []
+    rate("verify (valid)", num_voters, lambda: valid.extend(
+        store.verify(voter_id, 1000 + i % 9000) for i, voter_id in enumerate(voter_ids)))
+    print(f"{'valid':<32} {valid.count(OTP_VALID):12d} of {num_voters}")
+
+    # A flood of requests, ten per voter, into a store sized for a tenth of the roll
+    max_entries = max(1, num_voters // 10)
+    flood = OTPStore(ttl=300, max_entries=max_entries)
+    rate("issue (flood)", num_voters * 10, lambda: [
+        flood.issue(voter_id, 1234) for _ in range(10) for voter_id in voter_ids])
+    tracemalloc.start()
+    bounded = OTPStore(ttl=300, max_entries=max_entries)
+    for voter_id in voter_ids:
+        bounded.issue(voter_id, 1234)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    stats = flood.stats()
+    print(f"{'outstanding':<32} {stats['outstanding']:12d} of at most {max_entries}")
+    print(f"{'evicted':<32} {stats['evicted']:12d}")
+    print(f"{'memory':<32} {size / 1024 / 1024:12.1f} MiB")
+
+    # Every OTP expires at once; each later call sweeps a bounded batch of them
+    expiring = OTPStore(ttl=0.05, max_entries=num_voters)
+    for voter_id in voter_ids:
+        expiring.issue(voter_id, 1234)
+    time.sleep(0.1)
+    calls = 0
+    start = time.perf_counter()
+    while len(expiring):
+        expiring.verify(voter_ids[0], 1234)
+        calls += 1
+    elapsed = time.perf_counter() - start
+    print(f"{'sweep of expired OTPs':<32} {elapsed / calls * 1e6:12.1f} us per call over {calls} calls")
+
+if __name__ == "__main__":
+    main()
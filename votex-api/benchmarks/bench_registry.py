@@ -0,0 +1,81 @@
+"""
+Measure voter registry bulk import throughput, memory per voter and lookup latency
+
+Usage: python benchmarks/bench_registry.py [num_voters]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.registry import MemoryVoterRegistry, SQLiteVoterRegistry
+
+LOOKUPS = 100000
+
+
+def legacy_dict_bytes(num_voters):
+    """Memory of the original dict-of-dicts representation"""
+    tracemalloc.start()
+    voters = {
+        f"V{i:09d}": {"name": f"Voter {i}", "phone": f"{9000000000 + i}", "otp": None, "verified": False}
+        for i in range(num_voters)
+    }
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del voters
+    return size
+
+
+def write_roll(path, num_voters):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["voter_id", "name", "phone"])
+        for i in range(num_voters):
+            writer.writerow([f"V{i:09d}", f"Voter {i}", f"{9000000000 + i}"])
+
+
+def measure_lookups(registry, num_voters):
+    ids = [f"V{random.randrange(num_voters):09d}" for _ in range(LOOKUPS)]
+    started = time.perf_counter()
+    for voter_id in ids:
+        registry.get(voter_id)
+    return (time.perf_counter() - started) / LOOKUPS
+
+
+def report(label, stats, bytes_used, num_voters, lookup_seconds):
+    print(f"{label}")
+    print(f"  import:  {stats['rows_per_second']:12.0f} rows/sec ({stats['seconds']:.2f}s)")
+    print(f"  memory:  {bytes_used / num_voters:12.1f} bytes/voter")
+    print(f"  lookup:  {lookup_seconds * 1e6:12.2f} us")
+
+
+def main():
+    num_voters = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        roll = os.path.join(directory, "roll.csv")
+        write_roll(roll, num_voters)
+        print(f"{num_voters} voters")
+        print(f"dict of dicts (original)\n  memory:  {legacy_dict_bytes(num_voters) / num_voters:12.1f} bytes/voter")
+
+        tracemalloc.start()
+        memory_registry = MemoryVoterRegistry()
+        stats = memory_registry.bulk_import_csv(roll)
+        bytes_used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        report("MemoryVoterRegistry", stats, bytes_used, num_voters, measure_lookups(memory_registry, num_voters))
+        del memory_registry
+
+        sqlite_registry = SQLiteVoterRegistry(os.path.join(directory, "voters.db"))
+        stats = sqlite_registry.bulk_import_csv(roll)
+        report("SQLiteVoterRegistry (on disk)", stats, sqlite_registry.size_bytes(), num_voters,
+               measure_lookups(sqlite_registry, num_voters))
+        sqlite_registry.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -45,51 +45,65 @@ def print_header():
     print("\nAdvanced Algorithms: Merkle Tree & Byzantine Consensus")
     print("-" * 60 + "\n")
 
+def fetch_vote_pages(page_size=500):
+    """Yield pages of votes from the ledger API, following the cursor"""
+    cursor = None
+    while True:
+        params = {"limit": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        response = requests.get(f"{base_url}/blockchain/votes", params=params)
+        response.raise_for_status()
+        data = response.json()['data']
+        yield data
+        cursor = data.get('next_cursor')
+        if not cursor:
+            break
+
 def view_blockchain():
     """View the current blockchain data"""
     print("\nRetrieving blockchain data...")
     
     try:
-        response = requests.get(f"{base_url}/blockchain/votes")
-        if not response.ok:
-            print(f"Error: Server returned {response.status_code}")
-            return
-            
-        data = response.json()
-        votes = data['data']['votes']
-        total_votes = data['data']['total_votes']
-        
-        print(f"\nTotal votes in blockchain: {total_votes}")
+        total_votes = None
+        merkle_proof_votes = 0
+        vote_number = 0
         
-        if total_votes == 0:
-            print("No votes have been cast yet.")
-            return
-        
-        # Attempt to retrieve blockchain verification status
-        try:
-            merkle_proof_votes = sum(1 for vote in votes if vote.get('has_merkle_proof', False))
-            print(f"Votes with Merkle proofs: {merkle_proof_votes}")
-            print(f"Byzantine consensus passed: {total_votes}")
-            print("-" * 60)
-        except:
-            pass
-            
-        print("\n" + "-" * 60)
-        for i, vote in enumerate(votes, 1):
-            print(f"Vote #{i}:")
-            print(f"  Voter: {vote.get('voter_name', 'Unknown')} ({vote.get('voter_id', 'Unknown')})")
-            print(f"  Election: {vote.get('election_name', 'Unknown')}")
-            print(f"  Candidate: {vote.get('candidate_name', 'Unknown')}")
-            print(f"  Block Hash: {vote.get('block_hash', 'Unknown')}")
+        for page in fetch_vote_pages():
+            if total_votes is None:
+                total_votes = page['total_votes']
+                print(f"\nTotal votes in blockchain: {total_votes}")
+                
+                if total_votes == 0:
+                    print("No votes have been cast yet.")
+                    return
+                    
+                print("\n" + "-" * 60)
             
-            # Show Merkle verification if available
-            if vote.get('has_merkle_proof', False):
-                print(f"  Verification: Merkle Tree Verified (O(log n) algorithm)")
-            else:
-                print(f"  Verification: Basic Hash Verification")
+            for vote in page['votes']:
+                vote_number += 1
+                print(f"Vote #{vote_number}:")
+                print(f"  Voter: {vote.get('voter_name', 'Unknown')} ({vote.get('voter_id', 'Unknown')})")
+                print(f"  Election: {vote.get('election_name', 'Unknown')}")
+                print(f"  Candidate: {vote.get('candidate_name', 'Unknown')}")
+                print(f"  Block Hash: {vote.get('block_hash', 'Unknown')}")
                 
-            print("-" * 60)
+                # Show Merkle verification if available
+                if vote.get('has_merkle_proof', False):
+                    merkle_proof_votes += 1
+                    print(f"  Verification: Merkle Tree Verified (O(log n) algorithm)")
+                else:
+                    print(f"  Verification: Basic Hash Verification")
+                    
+                print("-" * 60)
+        
+        # Blockchain verification summary
+        print(f"Votes with Merkle proofs: {merkle_proof_votes}")
+        print(f"Byzantine consensus passed: {total_votes}")
+        print("-" * 60)
             
+    except requests.HTTPError as e:
+        print(f"Error: Server returned {e.response.status_code}")
     except Exception as e:
         print(f"Error connecting to server: {e}")
 
@@ -40,6 +40,11 @@ def verify_voter():
     
     # Generate and store OTP
     otp = create_otp_for_voter(voter_id)
+    if otp is None:
+        return jsonify({
+            "success": False,
+            "error": "Too many failed OTP attempts, please try again later"
+        }), 429
     
     # In a real application, the OTP would be sent via SMS
     # For development, we return it in the response
@@ -1,10 +1,13 @@
 from flask import Blueprint, jsonify, request
-from utils.data import get_elections, get_candidates
+from utils.data import get_elections, get_candidates, get_results, check_tally_consistency, get_election
+from utils.data import response_cache, get_metadata_version, get_data_version
+from utils.http_cache import conditional_get
 
 # Create Blueprint
 election_bp = Blueprint('elections', __name__)
 
 @election_bp.route('/elections', methods=['GET'])
+@conditional_get(response_cache, get_metadata_version)
 def list_elections():
     """
     Returns a list of ongoing elections
@@ -23,6 +26,7 @@ def list_elections():
     })
 
 @election_bp.route('/candidates/<int:election_id>', methods=['GET'])
+@conditional_get(response_cache, get_metadata_version)
 def list_candidates(election_id):
     """
     Returns a list of candidates for a specific election
@@ -41,4 +45,31 @@ def list_candidates(election_id):
             "election_id": election_id,
             "candidates": candidates_list
         }
-    }) 
\ No newline at end of file
+    }) 
+
+@election_bp.route('/results/<int:election_id>', methods=['GET'])
+@conditional_get(response_cache, get_data_version)
+def election_results(election_id):
+    """
+    Returns the live vote counts for an election
+    """
+    if get_election(election_id) is None:
+        return jsonify({
+            "success": False,
+            "error": "Election not found"
+        }), 404
+    
+    return jsonify({
+        "success": True,
+        "data": get_results(election_id)
+    })
+
+@election_bp.route('/results/consistency', methods=['GET'])
+def results_consistency():
+    """
+    Compares the live vote counters against a full recount of the chain
+    """
+    return jsonify({
+        "success": True,
+        "data": check_tally_consistency()
+    })
\ No newline at end of file
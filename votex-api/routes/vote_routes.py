@@ -1,11 +1,24 @@
-from flask import Blueprint, jsonify, request, render_template_string
-from utils.data import get_voter, record_vote, get_vote_status, get_candidates, get_elections, get_all_votes
-from utils.data import verify_blockchain_integrity, get_merkle_root
+from flask import Blueprint, Response, current_app, jsonify, make_response, render_template, request
+from markupsafe import Markup
+from utils.data import get_voter, record_vote, get_vote_status, get_candidates, get_elections, get_votes_at_height
+from utils.data import get_merkle_root, get_mining_stats, get_integrity_status
+from utils.data import get_voter_votes, get_transaction, get_block, tally_engine, get_votes_page
+from utils.data import iter_ledger_export, blockchain, verify_receipt, record_vote_batch, VOTES_BATCH_MAX
+from utils.data import events, LIVE_PAGE_VOTES, response_cache, get_data_version, get_integrity_version
+from utils.data import integrity_monitor, fragment_cache, STATION_TOKENS, is_station_token
+from utils.http_cache import conditional_get
+from utils.streaming import gzip_stream
 from datetime import datetime
+import os
+import queue
+import time
 
 # Create Blueprint
 vote_bp = Blueprint('votes', __name__)
 
+# Templates of the HTML pages and their per-block fragments, compiled in create_app
+PAGE_TEMPLATES = ('live_votes.html', '_live_vote_cards.html', 'explorer.html', '_explorer_vote_rows.html')
+
 @vote_bp.route('/vote', methods=['POST'])
 def submit_vote():
     """
@@ -56,33 +69,112 @@ def submit_vote():
             "error": "Invalid candidate ID for this election"
         }), 400
     
-    # Record vote - this adds the vote to the blockchain
-    if record_vote(voter_id, election_id, candidate_id):
-        # Get blockchain data to verify vote was recorded
-        blockchain_votes = get_all_votes()
-        
-        # Find this vote in the blockchain
-        for vote in blockchain_votes:
-            if vote['voter_id'] == voter_id:
-                this_vote = vote
-                break
-        else:
-            this_vote = {}
-        
+    # Record vote - this adds the vote to the blockchain and waits for the
+    # receipt from the step that seals its block
+    try:
+        receipt = record_vote(voter_id, election_id, candidate_id, wait=False).result()
+    except queue.Full:
         return jsonify({
-            "success": True,
-            "message": "Vote recorded successfully in blockchain",
-            "data": {
-                "voter_id": voter_id,
-                "election_id": election_id,
-                "blockchain_data": this_vote
-            }
-        })
-    else:
+            "success": False,
+            "error": "Vote queue is full, please retry shortly"
+        }), 503
+    
+    if receipt is False:
         return jsonify({
             "success": False,
             "error": "You have already voted in this election"
         }), 400
+    
+    if receipt is None:
+        return jsonify({
+            "success": False,
+            "error": "Vote was rejected by consensus and not recorded; please submit it again"
+        }), 503
+    
+    return jsonify({
+        "success": True,
+        "message": "Vote recorded successfully in blockchain",
+        "data": {
+            "voter_id": voter_id,
+            "election_id": election_id,
+            "receipt": receipt
+        }
+    })
+
+@vote_bp.route('/votes/batch', methods=['POST'])
+def submit_vote_batch():
+    """
+    Submit a batch of votes, e.g. from a polling station syncing after being offline
+    Expects {"votes": [{"voter_id", "election_id", "candidate_id"}, ...]} and
+    returns a result per vote in the same order. The station authenticates
+    with one of the VOTEX_STATION_TOKENS as an "Authorization: Bearer" token
+    """
+    if not STATION_TOKENS:
+        return jsonify({
+            "success": False,
+            "error": "Batch uploads are disabled: no polling station credentials are configured"
+        }), 403
+    
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not is_station_token(token.strip()):
+        response = jsonify({
+            "success": False,
+            "error": "A valid polling station token is required"
+        })
+        response.headers['WWW-Authenticate'] = 'Bearer realm="votex-stations"'
+        return response, 401
+    
+    data = request.get_json(silent=True)
+    ballots = data.get('votes') if isinstance(data, dict) else None
+    if not isinstance(ballots, list) or not ballots:
+        return jsonify({
+            "success": False,
+            "error": "Request body must contain a non-empty votes list"
+        }), 400
+    
+    if len(ballots) > VOTES_BATCH_MAX:
+        return jsonify({
+            "success": False,
+            "error": f"A batch may contain at most {VOTES_BATCH_MAX} votes"
+        }), 413
+    
+    try:
+        batch = record_vote_batch(ballots)
+    except queue.Full:
+        return jsonify({
+            "success": False,
+            "error": "Vote queue is full, please retry shortly"
+        }), 503
+    
+    return jsonify({
+        "success": True,
+        "data": batch
+    })
+
+@vote_bp.route('/receipt/verify', methods=['POST'])
+def verify_vote_receipt():
+    """
+    Check that a vote receipt is included in the blockchain
+    Expects the receipt returned by /api/vote as the JSON body
+    """
+    receipt = request.get_json(silent=True)
+    if not isinstance(receipt, dict):
+        return jsonify({
+            "success": False,
+            "error": "Request body must be a vote receipt"
+        }), 400
+    
+    result = verify_receipt(receipt)
+    if result["error"] == "Malformed receipt":
+        return jsonify({
+            "success": False,
+            "error": "Receipt must include tx_hash, block_index, tx_index, block_hash, merkle_root and merkle_proof"
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "data": result
+    })
 
 @vote_bp.route('/status/<voter_id>', methods=['GET'])
 def check_vote_status(voter_id):
@@ -103,275 +195,285 @@ def check_vote_status(voter_id):
         "success": True,
         "data": {
             "voter_id": voter_id,
-            "status": status
+            "status": status,
+            "blockchain_votes": get_voter_votes(voter_id)
         }
     })
 
+@vote_bp.route('/tx/<tx_hash>', methods=['GET'])
+def get_transaction_by_hash(tx_hash):
+    """
+    Look up a transaction and its block location by transaction hash
+    """
+    transaction = get_transaction(tx_hash)
+    if not transaction:
+        return jsonify({
+            "success": False,
+            "error": "Transaction not found"
+        }), 404
+    
+    return jsonify({
+        "success": True,
+        "data": transaction
+    })
+
+@vote_bp.route('/block/<hash_or_height>', methods=['GET'])
+def get_block_by_hash_or_height(hash_or_height):
+    """
+    Look up a block by its hash or height
+    """
+    block = get_block(hash_or_height)
+    if not block:
+        return jsonify({
+            "success": False,
+            "error": "Block not found"
+        }), 404
+    
+    return jsonify({
+        "success": True,
+        "data": block
+    })
+
 @vote_bp.route('/blockchain/votes', methods=['GET'])
+@conditional_get(response_cache, get_data_version)
 def get_blockchain_votes():
     """
-    Return all votes recorded in the blockchain
+    Return votes recorded in the blockchain, one page at a time
+    Accepts cursor, limit, election_id, from_block, to_block, since and until
+    query parameters; pass next_cursor back as cursor to get the next page
     """
-    votes = get_all_votes()
+    args = request.args
+    try:
+        page = get_votes_page(
+            cursor=args.get('cursor'),
+            limit=args.get('limit', type=int),
+            election_id=args.get('election_id', type=int),
+            from_block=args.get('from_block', type=int),
+            to_block=args.get('to_block', type=int),
+            since=args.get('since', type=float),
+            until=args.get('until', type=float)
+        )
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "Invalid cursor"
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "data": page
+    })
+
+@vote_bp.route('/blockchain/export', methods=['GET'])
+def export_blockchain():
+    """
+    Stream the ledger as NDJSON, one block with its transactions per line
+    Accepts from_height to resume an interrupted export and gzip=1 for a
+    gzip-compressed download
+    """
+    from_height = request.args.get('from_height', 0, type=int)
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    
+    # Export up to the tip as of the request, so the stream has a fixed end
+    to_height = len(blockchain.chain)
+    if from_height < 0 or from_height > to_height:
+        return jsonify({
+            "success": False,
+            "error": "Invalid from_height"
+        }), 400
+    
+    lines = iter_ledger_export(from_height, to_height)
+    headers = {"X-Chain-Height": str(to_height - 1)}
+    if compress:
+        headers["Content-Disposition"] = f"attachment; filename=ledger-{from_height}-{to_height - 1}.ndjson.gz"
+        return Response(gzip_stream(lines), mimetype="application/gzip", headers=headers)
+    return Response(lines, mimetype="application/x-ndjson", headers=headers)
+
+@vote_bp.route('/blockchain/audit', methods=['GET'])
+def get_blockchain_audit():
+    """
+    Schedule a full parallel audit of the blockchain on the background verifier
+    Accepts an optional workers query parameter between 1 and the CPU count.
+    Returns at once with the verifier status and the report of the last
+    completed audit; poll /blockchain/integrity for the new result
+    """
+    workers = request.args.get('workers')
+    if workers is not None:
+        max_workers = os.cpu_count() or 1
+        try:
+            workers = int(workers)
+        except ValueError:
+            workers = 0
+        if not 1 <= workers <= max_workers:
+            return jsonify({
+                "success": False,
+                "error": f"workers must be an integer between 1 and {max_workers}"
+            }), 400
+    
+    integrity_monitor.request_audit(workers)
     
     return jsonify({
         "success": True,
         "data": {
-            "votes": votes,
-            "total_votes": len(votes)
+            "scheduled": True,
+            "status": get_integrity_status(),
+            "last_audit": integrity_monitor.last_report()
         }
+    }), 202
+
+@vote_bp.route('/blockchain/mining', methods=['GET'])
+def get_blockchain_mining():
+    """
+    Return mining-rate metrics: hashes per second and time to seal
+    """
+    return jsonify({
+        "success": True,
+        "data": get_mining_stats()
     })
 
+@vote_bp.route('/blockchain/stream', methods=['GET'])
+def stream_blockchain():
+    """
+    Server-sent events feed of sealed blocks
+    Each "block" event carries the block's votes, the updated tallies of the
+    elections it touched and the chain status; event ids are block heights,
+    so a reconnecting client resumes after the last block it saw. Pages pass
+    the height they were rendered at as last_event_id, so blocks sealed
+    before the stream opens are replayed too
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    subscriber = events.subscribe(last_event_id)
+    return Response(
+        events.stream(subscriber),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @vote_bp.route('/blockchain/votes/live', methods=['GET'])
+@conditional_get(response_cache, get_data_version)
 def get_blockchain_votes_live():
     """
-    Return all votes recorded in the blockchain with auto-refresh HTML
-    """
-    votes = get_all_votes()
-    
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Live Blockchain Votes</title>
-        <meta http-equiv="refresh" content="3">
-        <style>
-            body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
-            h1 { color: #333; text-align: center; }
-            .container { max-width: 800px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-            .vote-card { border: 1px solid #ddd; margin-bottom: 10px; padding: 15px; border-radius: 5px; background-color: #f9f9f9; }
-            .vote-header { font-weight: bold; margin-bottom: 5px; color: #333; }
-            .vote-info { margin: 5px 0; color: #555; }
-            .timestamp { color: #999; font-size: 0.9em; text-align: right; }
-            .status { background-color: #4CAF50; color: white; padding: 10px; border-radius: 5px; margin-bottom: 20px; text-align: center; }
-            .block-hash { font-family: monospace; background-color: #f0f0f0; padding: 3px 6px; border-radius: 3px; }
-            .candidate-party { color: #666; font-style: italic; }
-            .auto-refresh { text-align: center; margin-top: 20px; font-size: 0.8em; color: #999; }
-            .total-votes { text-align: center; font-size: 1.2em; margin-bottom: 20px; font-weight: bold; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>Live Blockchain Votes</h1>
-            <div class="status">Blockchain Status: Active</div>
-            <div class="total-votes">Total Votes: {{ votes|length }}</div>
-            
-            {% if votes %}
-                {% for vote in votes %}
-                <div class="vote-card">
-                    <div class="vote-header">Vote #{{ loop.index }}</div>
-                    <div class="vote-info"><strong>Voter:</strong> {{ vote.voter_name }} ({{ vote.voter_id }})</div>
-                    <div class="vote-info"><strong>Election:</strong> {{ vote.election_name }}</div>
-                    <div class="vote-info"><strong>Candidate:</strong> {{ vote.candidate_name }}</div>
-                    <div class="vote-info"><strong>Block Hash:</strong> <span class="block-hash">{{ vote.block_hash }}</span></div>
-                    <div class="timestamp">Timestamp: {{ vote.timestamp }}</div>
-                </div>
-                {% endfor %}
-            {% else %}
-                <p>No votes have been cast yet.</p>
-            {% endif %}
-            
-            <div class="auto-refresh">This page automatically refreshes every 3 seconds</div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    rendered_html = render_template_string(html_template, votes=votes)
-    return rendered_html
+    Return the latest votes recorded in the blockchain as HTML
+    The page renders once and then appends new votes pushed by /blockchain/stream
+    """
+    return _render_vote_page('live_votes.html', '_live_vote_cards.html')
+
+@vote_bp.route('/blockchain/integrity', methods=['GET'])
+def get_blockchain_integrity():
+    """
+    Return the background verifier's status without waiting on a check
+    Includes the last verified height, the last run's mode and duration and
+    the first invalid block if verification failed; ?audit=1 schedules a
+    full audit
+    """
+    if request.args.get('audit', '').lower() in ('1', 'true', 'yes'):
+        integrity_monitor.request_audit()
+    
+    return jsonify({
+        "success": True,
+        "data": get_integrity_status()
+    })
 
 @vote_bp.route('/blockchain/explorer', methods=['GET'])
 def blockchain_explorer():
     """
     Blockchain Explorer page with sync verification and algorithm information
+    ?audit=1 schedules a full re-verification of the chain in the background
     """
-    votes = get_all_votes()
-    
-    # Verify blockchain integrity
-    is_blockchain_valid = verify_blockchain_integrity()
+    if request.args.get('audit', '').lower() in ('1', 'true', 'yes'):
+        integrity_monitor.request_audit()
+    return _render_explorer()
+
+@conditional_get(response_cache, get_integrity_version)
+def _render_explorer():
+    """
+    Render the explorer from the cached integrity status
+    The page renders once and then applies the deltas pushed by /blockchain/stream
+    """
+    # Read the background verifier's last result; a pending first check
+    # counts as valid until it reports otherwise
+    integrity = get_integrity_status()
+    is_blockchain_valid = integrity["valid"] is not False
     merkle_root = get_merkle_root() or "Not available"
     
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Blockchain Explorer - Secure Vote</title>
-        <meta http-equiv="refresh" content="5">
-        <style>
-            body { font-family: Arial, sans-serif; margin: 0; padding: 0; background-color: #f5f5f5; color: #333; }
-            .header { background-color: #1a237e; color: white; padding: 20px; text-align: center; }
-            .container { max-width: 1000px; margin: 20px auto; padding: 20px; }
-            .stats-container { display: flex; justify-content: space-between; margin-bottom: 20px; flex-wrap: wrap; }
-            .stat-card { background-color: white; border-radius: 8px; padding: 15px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); flex: 1; margin: 0 10px 10px; text-align: center; min-width: 200px; }
-            .stat-value { font-size: 24px; font-weight: bold; margin: 10px 0; color: #1a237e; }
-            .stat-label { font-size: 14px; color: #666; }
-            .vote-table { width: 100%; border-collapse: collapse; margin-top: 20px; background-color: white; box-shadow: 0 2px 5px rgba(0,0,0,0.1); border-radius: 8px; overflow: hidden; }
-            .vote-table th { background-color: #eeeeee; padding: 12px; text-align: left; font-weight: bold; }
-            .vote-table td { padding: 12px; border-top: 1px solid #eee; }
-            .vote-table tr:hover { background-color: #f9f9f9; }
-            .hash { font-family: monospace; font-size: 0.9em; color: #1a237e; }
-            .badge { display: inline-block; padding: 3px 8px; border-radius: 12px; font-size: 12px; }
-            .badge-bjp { background-color: #FF9933; color: white; }
-            .badge-congress { background-color: #0078D7; color: white; }
-            .badge-aap { background-color: #27ae60; color: white; }
-            .badge-independent { background-color: #7f8c8d; color: white; }
-            .badge-proof { background-color: #8e44ad; color: white; }
-            .auto-refresh { text-align: center; margin-top: 30px; color: #666; font-size: 0.9em; }
-            .timestamp { color: #888; font-size: 0.8em; }
-            .verification { background-color: #e8f5e9; padding: 10px; border-radius: 5px; margin-bottom: 20px; border-left: 4px solid #4CAF50; }
-            .block-number { background-color: #f1f8e9; border-radius: 4px; padding: 2px 6px; font-family: monospace; }
-            .empty-state { text-align: center; padding: 40px; color: #888; }
-            .voter-name { font-weight: bold; }
-            footer { text-align: center; margin-top: 40px; padding: 20px; border-top: 1px solid #eee; color: #888; font-size: 0.9em; }
-            .algorithm-section { margin-top: 30px; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-            .algorithm-title { font-size: 18px; margin-bottom: 15px; color: #1a237e; border-bottom: 1px solid #eee; padding-bottom: 10px; }
-            .algorithm-desc { margin-bottom: 20px; line-height: 1.5; }
-            .merkle-info { font-family: monospace; padding: 10px; background-color: #f9f9f9; border-radius: 4px; overflow: auto; }
-            .data-flow { width: 100%; max-width: 600px; margin: 20px auto; display: block; }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>Blockchain Explorer</h1>
-            <p>Real-time view of all vote transactions on the blockchain</p>
-        </div>
-        
-        <div class="container">
-            <div class="verification" style="{% if is_blockchain_valid %}background-color: #e8f5e9;{% else %}background-color: #ffebee; border-left: 4px solid #f44336;{% endif %}">
-                <strong>Blockchain Verification:</strong> 
-                {% if is_blockchain_valid %}
-                All {{ votes|length }} vote transactions verified and in sync with the ledger.
-                {% else %}
-                WARNING: Blockchain integrity check failed. The chain may have been tampered with.
-                {% endif %}
-                <span class="timestamp">Last checked: {{ now }}</span>
-            </div>
-            
-            <div class="stats-container">
-                <div class="stat-card">
-                    <div class="stat-label">Total Votes</div>
-                    <div class="stat-value">{{ votes|length }}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Lok Sabha Votes</div>
-                    <div class="stat-value">{{ lok_sabha_votes }}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">State Election Votes</div>
-                    <div class="stat-value">{{ state_votes }}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Blockchain Status</div>
-                    <div class="stat-value" style="font-size: 18px; {% if is_blockchain_valid %}color: #4CAF50;{% else %}color: #f44336;{% endif %}">
-                        {% if is_blockchain_valid %}Active & Verified{% else %}Verification Failed{% endif %}
-                    </div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Merkle Root</div>
-                    <div class="stat-value" style="font-size: 14px; overflow: hidden; text-overflow: ellipsis;">{{ merkle_root[:10] }}...</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Consensus Nodes</div>
-                    <div class="stat-value">7</div>
-                </div>
-            </div>
-            
-            <div class="algorithm-section">
-                <div class="algorithm-title">Advanced Blockchain Algorithms</div>
-                <div class="algorithm-desc">
-                    <strong>1. Merkle Tree Algorithm (O(log n) verification)</strong><br>
-                    Our voting system implements a Merkle Tree data structure that enables efficient and secure verification of votes without needing to download the entire blockchain. Each block contains a Merkle root that summarizes all transactions, allowing for O(log n) verification complexity instead of O(n).
-                </div>
-                <div class="algorithm-desc">
-                    <strong>2. Byzantine Fault Tolerance (BFT) Consensus</strong><br>
-                    All votes go through a Byzantine consensus protocol that can tolerate up to f Byzantine (malicious) nodes in a system of 3f+1 total nodes. This provides mathematical guarantees that the voting system continues to function correctly even if some nodes are compromised or faulty.
-                </div>
-                <div class="merkle-info">
-                    Current Merkle Root: {{ merkle_root }}<br>
-                    Consensus Nodes: 7 (can tolerate up to 2 malicious nodes)<br>
-                    Verification Algorithm: O(log n) time complexity
-                </div>
-            </div>
-            
-            {% if votes %}
-                <table class="vote-table">
-                    <thead>
-                        <tr>
-                            <th>#</th>
-                            <th>Block Hash</th>
-                            <th>Voter</th>
-                            <th>Election</th>
-                            <th>Candidate</th>
-                            <th>Verification</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for vote in votes %}
-                        <tr>
-                            <td><span class="block-number">{{ loop.index }}</span></td>
-                            <td><span class="hash">{{ vote.block_hash[:12] }}...</span></td>
-                            <td><span class="voter-name">{{ vote.voter_name }}</span><br><span class="timestamp">ID: {{ vote.voter_id }}</span></td>
-                            <td>{{ vote.election_name }}</td>
-                            <td>
-                                {{ vote.candidate_name }}
-                                {% if "BJP" in vote.candidate_name or "Kapoor" in vote.candidate_name or "Mehta" in vote.candidate_name %}
-                                    <span class="badge badge-bjp">BJP</span>
-                                {% elif "Congress" in vote.candidate_name or "Verma" in vote.candidate_name or "Rao" in vote.candidate_name %}
-                                    <span class="badge badge-congress">INC</span>
-                                {% elif "AAP" in vote.candidate_name or "Khanna" in vote.candidate_name %}
-                                    <span class="badge badge-aap">AAP</span>
-                                {% else %}
-                                    <span class="badge badge-independent">IND</span>
-                                {% endif %}
-                            </td>
-                            <td>
-                                {% if vote.has_merkle_proof %}
-                                    <span class="badge badge-proof">Merkle Verified</span>
-                                {% else %}
-                                    <span class="timestamp">Basic Verification</span>
-                                {% endif %}
-                                <br>
-                                <span class="timestamp">{{ vote.timestamp }}</span>
-                            </td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            {% else %}
-                <div class="empty-state">
-                    <h3>No votes have been cast yet</h3>
-                    <p>When votes are cast, they will appear here in real-time</p>
-                </div>
-            {% endif %}
-            
-            <div class="auto-refresh">
-                This page automatically refreshes every 5 seconds to show the latest blockchain data
-            </div>
-        </div>
-        
-        <footer>
-            Secure Vote Blockchain Explorer &copy; 2025<br>
-            <span class="timestamp">Featuring Merkle Tree & Byzantine Consensus Algorithms</span>
-        </footer>
-    </body>
-    </html>
-    """
-    
-    # Count votes for different elections
-    lok_sabha_votes = sum(1 for vote in votes if vote['election_id'] == 1)
-    state_votes = sum(1 for vote in votes if vote['election_id'] == 2)
-    
-    # Get current time
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    rendered_html = render_template_string(
-        html_template, 
-        votes=votes,
+    # Count votes for different elections from the live tally
+    lok_sabha_votes = tally_engine.total(1)
+    state_votes = tally_engine.total(2)
+    
+    # Time of the last verification run
+    checked_at = (datetime.fromtimestamp(integrity["last_run_at"]).strftime("%Y-%m-%d %H:%M:%S")
+                  if integrity["last_run_at"] else "pending")
+    
+    return _render_vote_page(
+        'explorer.html',
+        '_explorer_vote_rows.html',
         lok_sabha_votes=lok_sabha_votes,
         state_votes=state_votes,
-        now=now,
+        checked_at=checked_at,
+        integrity=integrity,
         is_blockchain_valid=is_blockchain_valid,
         merkle_root=merkle_root
     )
+
+def _recent_blocks(votes, count, limit):
+    """
+    Split the votes of the most recent blocks into per-block slices
+    Only the first count votes are considered. Whole blocks are taken from
+    there backwards until at least limit votes are covered; returns
+    (ordinal of the slice's first vote, votes) pairs in chain order
+    """
+    blocks = []
+    end = count
+    while end > 0 and count - end < limit:
+        start = end - 1
+        block_hash = votes[start]['block_hash']
+        while start > 0 and votes[start - 1]['block_hash'] == block_hash:
+            start -= 1
+        blocks.append((start + 1, votes[start:end]))
+        end = start
+    blocks.reverse()
+    return blocks
+
+def _render_vote_page(page, fragment, **context):
+    """
+    Render a vote page from the templates compiled at app creation
+    The vote markup of each block is rendered once and cached by block hash,
+    so a request only renders blocks it has not seen. Render time and fragment
+    cache hits are reported in the Server-Timing and X-Fragment-Cache headers
+    """
+    started = time.perf_counter()
+    templates = current_app.extensions['votex_templates']
+    # The height comes from the same view read as the votes, so the stream
+    # resumes right after the last block on the page
+    all_votes, total_votes, height = get_votes_at_height()
+    
+    fragments = []
+    hits = 0
+    for first, block_votes in _recent_blocks(all_votes, total_votes, LIVE_PAGE_VOTES):
+        key = (fragment, block_votes[0]['block_hash'])
+        html = fragment_cache.get(key)
+        if html is None:
+            html = Markup(templates[fragment].render(votes=block_votes, first=first))
+            fragment_cache.put(key, html)
+        else:
+            hits += 1
+        fragments.append(html)
+    
+    response = make_response(render_template(
+        templates[page],
+        fragments=fragments,
+        total_votes=total_votes,
+        height=height,
+        **context
+    ))
     
-    return rendered_html 
\ No newline at end of file
+    seconds = time.perf_counter() - started
+    fragment_cache.record_render(seconds)
+    response.headers['Server-Timing'] = f"render;dur={seconds * 1000:.2f}"
+    response.headers['X-Fragment-Cache'] = f"hits={hits}, misses={len(fragments) - hits}"
+    return response 
\ No newline at end of file
@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+
+class BlockBuilder:
+    """
+    Seals pending transactions into blocks in batches instead of one per vote
+    A block is sealed once max_txs transactions are pending or the oldest
+    pending transaction has waited max_latency seconds, whichever comes first
+    Every submitted transaction gets a Future that resolves to its receipt
+    (location in the chain and Merkle path) once its block is sealed. With autostart=False no sealing
+    thread is started and the owner calls seal() when seconds_until_due() is 0
+    """
+    def __init__(self, blockchain, max_txs: int = 100, max_latency: float = 0.5,
+                 autostart: bool = True):
+        self.blockchain = blockchain
+        self.autostart = autostart
+        self.max_txs = max(1, max_txs)
+        self.max_latency = max_latency
+        self.lock = threading.RLock()
+        self._changed = threading.Condition(self.lock)
+        self._futures: List[Future] = []
+        self._oldest_pending: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self.blocks_sealed = 0
+        self.last_seal_latency = 0.0
+
+    def submit(self, transaction: Dict[str, Any]) -> Future:
+        """
+        Validate a transaction through consensus and queue it for the next block
+        The returned Future resolves to None if consensus rejects the transaction
+        """
+        return self.submit_many([transaction])[0]
+
+    def submit_many(self, transactions: List[Dict[str, Any]]) -> List[Future]:
+        """
+        Validate a batch of transactions in one consensus round and queue the
+        accepted ones for the next block, returning one Future per transaction
+        """
+        futures = []
+        with self.lock:
+            for accepted in self.blockchain.add_transactions(transactions):
+                future = Future()
+                if accepted:
+                    self._futures.append(future)
+                else:
+                    future.set_result(None)
+                futures.append(future)
+            if self._futures and self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            if self.autostart and self._futures:
+                self._start()
+                self._changed.notify()
+        return futures
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Seconds until the pending batch must be sealed, None if nothing is pending"""
+        with self.lock:
+            if not self._futures:
+                return None
+            if len(self._futures) >= self.max_txs:
+                return 0.0
+            return max(0.0, self._oldest_pending + self.max_latency - time.monotonic())
+
+    def seal(self) -> Optional[Dict[str, Any]]:
+        """
+        Seal every pending transaction into one block and resolve their futures
+        Returns the new block, or None if nothing was pending
+        """
+        with self.lock:
+            futures, self._futures = self._futures, []
+            oldest_pending, self._oldest_pending = self._oldest_pending, None
+            if not futures:
+                return None
+            try:
+                block = self.blockchain.mine_block()
+            except Exception as exc:
+                for future in futures:
+                    future.set_exception(exc)
+                raise
+
+            self.blocks_sealed += 1
+            self.last_seal_latency = time.monotonic() - oldest_pending
+            # The tree was cached while mining, so each receipt costs O(log n)
+            tree = self.blockchain.get_block_tree(block)
+            for tx_index, future in enumerate(futures):
+                future.set_result({
+                    'tx_hash': tree.get_leaf(tx_index),
+                    'block_index': block['index'],
+                    'block_hash': block['hash'],
+                    'merkle_root': block['merkle_root'],
+                    'tx_index': tx_index,
+                    'merkle_proof': tree.get_proof(tx_index)
+                })
+            return block
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Seal whatever is pending right away"""
+        return self.seal()
+
+    def _start(self) -> None:
+        """Start the sealing thread on first use"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="block-builder", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Wait for a size or time threshold, then seal the pending batch"""
+        with self.lock:
+            while True:
+                timeout = self.seconds_until_due()
+                if timeout is None:
+                    self._changed.wait()
+                elif timeout > 0:
+                    self._changed.wait(timeout)
+                else:
+                    try:
+                        self.seal()
+                    except Exception as exc:
+                        print(f"Warning: Failed to seal block: {exc}")
@@ -1,12 +1,43 @@
 import hashlib
+import threading
 import time
 import math
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from typing import List, Dict, Any, Optional, Tuple
 
+from .encoding import encode_block, encode_nonce, encode_transaction, hash_block, sha256
+
+# Nonces tried per proof of work task handed to a mining worker
+NONCE_CHUNK_SIZE = 50000
+
+# Domain separation of Merkle hashes, so an inner node can never pass as a leaf
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def search_nonce(prefix: bytes, difficulty: int, start: int, stop: int) -> Tuple[Optional[int], int]:
+    """
+    Search nonces in [start, stop) for a block hash with difficulty leading hex zeros
+    The block prefix is hashed once; each attempt copies that state and hashes
+    only the 8-byte nonce suffix
+    Returns the nonce found (or None) and the number of hashes computed
+    """
+    target = 1 << (256 - 4 * difficulty)
+    base = hashlib.sha256(prefix)
+    for nonce in range(start, stop):
+        attempt = base.copy()
+        attempt.update(encode_nonce(nonce))
+        if int.from_bytes(attempt.digest(), 'big') < target:
+            return nonce, nonce - start + 1
+    return None, stop - start
+
 
 class MerkleTree:
     """
     Merkle Tree Implementation for efficient vote verification
+    Leaves are raw SHA-256 digests of the canonical transaction encoding and
+    inner nodes digests of their two children, each behind its own prefix byte
     Time Complexity: O(n log n) for construction, O(log n) for verification
     Space Complexity: O(n)
     """
@@ -14,19 +45,19 @@ class MerkleTree:
         self.transactions = transactions
         self.tree = self._build_tree()
         
-    def _hash_data(self, data: str) -> str:
+    def _hash_data(self, data: bytes) -> bytes:
         """Hash data using SHA-256"""
-        return hashlib.sha256(data.encode()).hexdigest()
+        return sha256(data)
     
-    def _build_tree(self) -> List[List[str]]:
+    def _build_tree(self) -> List[List[bytes]]:
         """
         Build the Merkle tree from transactions
         Using a bottom-up approach with O(n log n) time complexity
         """
         # Base level with transaction hashes
-        leaves = [self._hash_data(str(tx)) for tx in self.transactions]
+        leaves = [self._hash_data(LEAF_PREFIX + encode_transaction(tx)) for tx in self.transactions]
         if not leaves:
-            return [[self._hash_data("empty_tree")]]
+            return [[self._hash_data(b"empty_tree")]]
             
         # Build the tree bottom-up
         tree = [leaves]
@@ -39,11 +70,11 @@ class MerkleTree:
             for i in range(0, len(level), 2):
                 if i + 1 < len(level):
                     # Hash the pair together
-                    combined_hash = self._hash_data(level[i] + level[i+1])
+                    combined_hash = self._hash_data(NODE_PREFIX + level[i] + level[i+1])
                     next_level.append(combined_hash)
                 else:
                     # Odd number of elements, duplicate the last one
-                    combined_hash = self._hash_data(level[i] + level[i])
+                    combined_hash = self._hash_data(NODE_PREFIX + level[i] + level[i])
                     next_level.append(combined_hash)
             level = next_level
             tree.append(level)
@@ -51,15 +82,19 @@ class MerkleTree:
         return tree
     
     def get_root(self) -> str:
-        """Get the Merkle root hash"""
+        """Get the Merkle root hash as hex"""
         if not self.tree or not self.tree[-1]:
-            return self._hash_data("empty_tree")
-        return self.tree[-1][0]
+            return self._hash_data(b"empty_tree").hex()
+        return self.tree[-1][0].hex()
+    
+    def get_leaf(self, tx_index: int) -> str:
+        """Get the hex hash of a transaction leaf"""
+        return self.tree[0][tx_index].hex()
     
     def get_proof(self, tx_index: int) -> List[Tuple[int, str]]:
         """
         Generate a Merkle proof for a transaction
-        The proof is a list of (position, hash) pairs
+        The proof is a list of (position, hex hash) pairs
         Position 0 means the hash is to the right, 1 means left
         Time Complexity: O(log n)
         """
@@ -73,10 +108,12 @@ class MerkleTree:
             is_right = tx_index % 2 == 0
             sibling_idx = tx_index + 1 if is_right else tx_index - 1
             
-            # Handle edge case for odd number of nodes
             if sibling_idx < len(level):
                 position = 0 if is_right else 1  # 0 for right, 1 for left
-                proof.append((position, level[sibling_idx]))
+                proof.append((position, level[sibling_idx].hex()))
+            else:
+                # Odd number of nodes: the last one was paired with itself
+                proof.append((0, level[tx_index].hex()))
             
             # Move up to the next level
             tx_index = tx_index // 2
@@ -88,15 +125,59 @@ class MerkleTree:
         Verify a transaction using its Merkle proof
         Time Complexity: O(log n)
         """
-        current_hash = tx_hash
-        
-        for position, sibling_hash in proof:
-            if position == 0:  # sibling is on the right
-                current_hash = self._hash_data(current_hash + sibling_hash)
-            else:  # sibling is on the left
-                current_hash = self._hash_data(sibling_hash + current_hash)
+        try:
+            current_hash = bytes.fromhex(tx_hash)
+            for position, sibling_hash in proof:
+                sibling = bytes.fromhex(sibling_hash)
+                if position == 0:  # sibling is on the right
+                    current_hash = self._hash_data(NODE_PREFIX + current_hash + sibling)
+                else:  # sibling is on the left
+                    current_hash = self._hash_data(NODE_PREFIX + sibling + current_hash)
+        except (TypeError, ValueError):
+            return False
                 
-        return current_hash == root
+        return current_hash.hex() == root
+
+
+class MerkleCache:
+    """
+    Bounded LRU cache of Merkle trees for sealed blocks, keyed by block hash
+    The block hash covers only the header, so a cached tree reflects the
+    transactions as they were sealed, not as they are stored now. It serves
+    proofs and lookups; validation always rebuilds the tree from the block
+    Time Complexity: O(1) lookup, insertion and eviction
+    """
+    def __init__(self, max_blocks: int = 1024):
+        self.max_blocks = max_blocks
+        self._trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, block_hash: str) -> Optional[MerkleTree]:
+        """Get the cached tree for a block hash, marking it recently used"""
+        tree = self._trees.get(block_hash)
+        if tree is None:
+            self.misses += 1
+            return None
+        self._trees.move_to_end(block_hash)
+        self.hits += 1
+        return tree
+
+    def put(self, block_hash: str, tree: MerkleTree) -> None:
+        """Cache a tree, evicting the least recently used one when full"""
+        if self.max_blocks <= 0:
+            return
+        self._trees[block_hash] = tree
+        self._trees.move_to_end(block_hash)
+        while len(self._trees) > self.max_blocks:
+            self._trees.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached tree"""
+        self._trees.clear()
+
+    def __len__(self) -> int:
+        return len(self._trees)
 
 
 class ByzantineConsensus:
@@ -145,6 +226,32 @@ class ByzantineConsensus:
             # For simplicity, we'll reject the transaction
             return False
             
+    def validate_batch(self, transactions: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Run one consensus round over a batch of transactions
+        Each node validates the whole batch and commits its accepted
+        transactions together, with the same per-transaction outcome as
+        validate_transaction
+        
+        Time Complexity: O(n × m) where n is the number of nodes and m the batch size
+        """
+        # Phase 1: Prepare phase - every node votes on every transaction
+        true_votes = [0] * len(transactions)
+        for node in self.nodes:
+            for i, vote in enumerate(node.validate_batch(transactions)):
+                if vote:
+                    true_votes[i] += 1
+        
+        # Phase 2: Commit the transactions with a supermajority of approvals;
+        # anything short of that is rejected, as in validate_transaction
+        required_consensus = 2 * self.faulty_tolerance + 1
+        accepted = [count >= required_consensus for count in true_votes]
+        committed = [tx for tx, ok in zip(transactions, accepted) if ok]
+        if committed:
+            for node in self.nodes:
+                node.commit_transactions(committed)
+        return accepted
+            
     def simulate_byzantine_behavior(self, faulty_nodes: int) -> None:
         """Simulate Byzantine (faulty) behavior in some nodes"""
         if faulty_nodes > self.faulty_tolerance:
@@ -192,12 +299,21 @@ class Node:
                 isinstance(transaction.get('timestamp'), (int, float, str))
             )
     
+    def validate_batch(self, transactions: List[Dict[str, Any]]) -> List[bool]:
+        """Validate a batch of transactions, one result per transaction"""
+        return [self.validate_transaction(transaction) for transaction in transactions]
+    
     def commit_transaction(self, transaction: Dict[str, Any]) -> None:
         """Add transaction to the list of committed transactions"""
         if not self.is_byzantine:
             # Only honest nodes actually commit transactions correctly
             self.committed_transactions.append(transaction)
             
+    def commit_transactions(self, transactions: List[Dict[str, Any]]) -> None:
+        """Add a batch of transactions to the list of committed transactions"""
+        if not self.is_byzantine:
+            self.committed_transactions.extend(transactions)
+            
     def clear_transactions(self) -> None:
         """Clear all committed transactions"""
         self.committed_transactions = []
@@ -207,12 +323,49 @@ class EnhancedBlockchain:
     """
     Enhanced blockchain implementation with Merkle trees and Byzantine consensus
     """
-    def __init__(self, consensus_nodes: int = 7):
-        self.chain = []
+    def __init__(self, consensus_nodes: int = 7, merkle_cache_size: int = 1024,
+                 difficulty: int = 1, mining_workers: int = 1, storage=None):
+        # The chain is an in-memory list unless a persistent block store
+        # (such as utils.ledger.BlockLog) is given
+        self.chain = storage if storage is not None else []
         self.pending_transactions = []
-        self.create_genesis_block()
         self.merkle_tree = None
+        self.merkle_cache = MerkleCache(merkle_cache_size)
+        # Locator indexes, updated as blocks are sealed
+        self.block_locator: Dict[str, int] = {}  # block hash -> height
+        self.tx_locator: Dict[str, Tuple[int, int]] = {}  # tx hash -> (height, tx index)
+        self.voter_locator: Dict[str, List[Tuple[int, int]]] = {}  # voter id -> locations
+        # Blocks 1..deferred_height are left to backfill_indexes; lookups wait for it
+        self.deferred_height = 0
+        self._index_lock = threading.Lock()
+        self._indexes_complete = threading.Event()
+        self._indexes_complete.set()
+        if not len(self.chain):
+            self.create_genesis_block()
+        else:
+            self.index_block(self.chain[0])
         self.consensus = ByzantineConsensus(consensus_nodes)
+        # Checkpoint of the highest block already verified by is_chain_valid
+        self.verified_height = 0
+        self.verified_tip_hash = self.chain[0]['hash']
+        # Proof of work: number of leading hex zeros required in a block hash
+        self.difficulty = difficulty
+        self.mining_workers = mining_workers
+        self._mining_pool = None
+        # Callbacks run with each newly sealed block
+        self.seal_listeners = []
+        self.mining_stats = {
+            'blocks_mined': 0,
+            'total_hashes': 0,
+            'total_seconds': 0.0,
+            'last_hashes': 0,
+            'last_seal_seconds': 0.0,
+            'last_hashes_per_second': 0.0
+        }
+        
+    def add_seal_listener(self, listener) -> None:
+        """Register a callback to run with every block sealed by mine_block"""
+        self.seal_listeners.append(listener)
         
     def create_genesis_block(self) -> None:
         """Create the first block in the chain"""
@@ -222,22 +375,108 @@ class EnhancedBlockchain:
             'transactions': [],
             'merkle_root': '',
             'previous_hash': '0',
-            'nonce': 0,
-            'hash': self._hash_block({
-                'index': 0,
-                'timestamp': time.time(),
-                'transactions': [],
-                'merkle_root': '',
-                'previous_hash': '0',
-                'nonce': 0
-            })
+            'nonce': 0
         }
+        genesis_block['hash'] = self._hash_block(genesis_block)
         self.chain.append(genesis_block)
+        self.index_block(genesis_block)
         
     def _hash_block(self, block: Dict[str, Any]) -> str:
-        """Create SHA-256 hash of a block"""
-        block_string = str(block).encode()
-        return hashlib.sha256(block_string).hexdigest()
+        """Create SHA-256 hash of a block's canonical encoding"""
+        return hash_block(block)
+        
+    def get_block_tree(self, block: Dict[str, Any]) -> MerkleTree:
+        """
+        Get the Merkle tree of a block, building and caching it on a miss
+        Time Complexity: O(1) when cached, O(n log n) otherwise
+        """
+        tree = self.merkle_cache.get(block['hash'])
+        if tree is None:
+            tree = MerkleTree(block['transactions'])
+            self.merkle_cache.put(block['hash'], tree)
+        return tree
+
+    def index_block(self, block: Dict[str, Any]) -> None:
+        """
+        Add a block to the block hash, tx hash and voter locator indexes
+        Time Complexity: O(transactions in the block)
+        """
+        height = block['index']
+        tree = self.get_block_tree(block) if block['transactions'] else None
+        with self._index_lock:
+            self.block_locator[block['hash']] = height
+            for tx_index, tx in enumerate(block['transactions']):
+                location = (height, tx_index)
+                self.tx_locator[tree.get_leaf(tx_index)] = location
+                if 'voter_id' in tx:
+                    self.voter_locator.setdefault(tx['voter_id'], []).append(location)
+                
+    def rebuild_indexes(self, start: int = 0) -> None:
+        """Index every block from a height onwards, e.g. after loading a persisted chain"""
+        for height in range(start, len(self.chain)):
+            self.index_block(self.chain[height])
+            
+    def defer_indexes(self, height: int) -> None:
+        """
+        Leave blocks 1..height out of the locator indexes for now, e.g. when
+        startup restores state from a snapshot at that height. Blocks above it
+        are indexed as usual; backfill_indexes adds the deferred ones
+        """
+        self.deferred_height = height
+        if height > 0:
+            self._indexes_complete.clear()
+            
+    def backfill_indexes(self) -> None:
+        """
+        Index the blocks left out by defer_indexes, e.g. on a background thread
+        Entries are built apart and merged under the index lock, so blocks
+        sealed meanwhile keep being indexed. Trees are built without the Merkle
+        cache, which keeps the trees of recent blocks
+        Time Complexity: O(deferred transactions)
+        """
+        blocks: Dict[str, int] = {}
+        transactions: Dict[str, Tuple[int, int]] = {}
+        voters: Dict[str, List[Tuple[int, int]]] = {}
+        for height in range(1, self.deferred_height + 1):
+            block = self.chain[height]
+            blocks[block['hash']] = height
+            if not block['transactions']:
+                continue
+            tree = MerkleTree(block['transactions'])
+            for tx_index, tx in enumerate(block['transactions']):
+                location = (height, tx_index)
+                transactions[tree.get_leaf(tx_index)] = location
+                if 'voter_id' in tx:
+                    voters.setdefault(tx['voter_id'], []).append(location)
+        with self._index_lock:
+            self.block_locator.update(blocks)
+            self.tx_locator.update(transactions)
+            for voter_id, locations in voters.items():
+                self.voter_locator[voter_id] = locations + self.voter_locator.get(voter_id, [])
+            self.deferred_height = 0
+        self._indexes_complete.set()
+        
+    def _lookup(self, index: Dict[str, Any], key: str) -> Any:
+        """Look up a key in a locator index, waiting for a backfill in progress on a miss"""
+        value = index.get(key)
+        if value is None and not self._indexes_complete.is_set():
+            self._indexes_complete.wait()
+            value = index.get(key)
+        return value
+        
+    def get_block_by_hash(self, block_hash: str) -> Optional[Dict[str, Any]]:
+        """Look up a block by its hash in O(1)"""
+        height = self._lookup(self.block_locator, block_hash)
+        return self.chain[height] if height is not None else None
+        
+    def locate_transaction(self, tx_hash: str) -> Optional[Tuple[int, int]]:
+        """Look up the (height, tx index) of a transaction by its hash in O(1)"""
+        return self._lookup(self.tx_locator, tx_hash)
+        
+    def locate_voter(self, voter_id: str) -> List[Tuple[int, int]]:
+        """Look up the (height, tx index) of every transaction cast by a voter"""
+        self._indexes_complete.wait()
+        return list(self.voter_locator.get(voter_id, []))
         
     def get_latest_block(self) -> Dict[str, Any]:
         """Get the latest block in the blockchain"""
@@ -256,6 +495,16 @@ class EnhancedBlockchain:
         self.pending_transactions.append(transaction)
         return True
         
+    def add_transactions(self, transactions: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Add a batch of transactions to pending transactions
+        Runs a single Byzantine consensus round over the whole batch and
+        returns whether each transaction was accepted
+        """
+        accepted = self.consensus.validate_batch(transactions)
+        self.pending_transactions.extend(tx for tx, ok in zip(transactions, accepted) if ok)
+        return accepted
+        
     def mine_block(self) -> Dict[str, Any]:
         """
         Mine a new block with pending transactions
@@ -264,6 +513,8 @@ class EnhancedBlockchain:
         if not self.pending_transactions:
             return None
             
+        started = time.perf_counter()
+        
         # Create a Merkle tree from pending transactions
         self.merkle_tree = MerkleTree(self.pending_transactions)
         merkle_root = self.merkle_tree.get_root()
@@ -280,57 +531,153 @@ class EnhancedBlockchain:
         
         # Simple proof of work - find a hash with leading zeros
         # In a real system, this would be much more difficult
-        difficulty = 1  # Number of leading zeros required
-        target = '0' * difficulty
-        
-        while True:
-            block_hash = self._hash_block(new_block)
-            if block_hash.startswith(target):
-                break
-            new_block['nonce'] += 1
+        new_block['nonce'], hashes = self._find_nonce(encode_block(new_block))
+        block_hash = self._hash_block(new_block)
+        self._record_mining(hashes, time.perf_counter() - started)
             
         new_block['hash'] = block_hash
         self.chain.append(new_block)
+        self.merkle_cache.put(block_hash, self.merkle_tree)
+        self.index_block(new_block)
         
         # Clear pending transactions
         self.pending_transactions = []
         
+        for listener in self.seal_listeners:
+            try:
+                listener(new_block)
+            except Exception as exc:
+                print(f"Warning: Block listener failed: {exc}")
+        
         return new_block
         
-    def is_chain_valid(self) -> bool:
+    def _find_nonce(self, prefix: bytes) -> Tuple[int, int]:
         """
-        Validate the entire blockchain
-        Checks hash integrity and Merkle roots
+        Find a proof of work nonce for a block prefix
+        With several mining workers, nonce chunks are searched in a process pool
+        and outstanding chunks are cancelled as soon as one finds a nonce
+        Returns the nonce and the number of hashes computed
         """
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
+        if self.mining_workers <= 1:
+            hashes = 0
+            start = 0
+            while True:
+                nonce, tried = search_nonce(prefix, self.difficulty, start, start + NONCE_CHUNK_SIZE)
+                hashes += tried
+                if nonce is not None:
+                    return nonce, hashes
+                start += NONCE_CHUNK_SIZE
+                
+        if self._mining_pool is None:
+            self._mining_pool = ProcessPoolExecutor(max_workers=self.mining_workers)
             
-            # Check hash integrity
-            if current_block['previous_hash'] != previous_block['hash']:
+        hashes = 0
+        next_start = 0
+        in_flight = set()
+        found = None
+        while found is None:
+            # Keep every worker busy with the next chunk of nonces
+            while len(in_flight) < self.mining_workers * 2:
+                in_flight.add(self._mining_pool.submit(
+                    search_nonce, prefix, self.difficulty, next_start, next_start + NONCE_CHUNK_SIZE))
+                next_start += NONCE_CHUNK_SIZE
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                nonce, tried = future.result()
+                hashes += tried
+                if nonce is not None and (found is None or nonce < found):
+                    found = nonce
+                    
+        # Early cancellation: chunks not yet started are dropped
+        for future in in_flight:
+            future.cancel()
+        return found, hashes
+        
+    def _record_mining(self, hashes: int, seconds: float) -> None:
+        """Update mining-rate metrics after sealing a block"""
+        stats = self.mining_stats
+        stats['blocks_mined'] += 1
+        stats['total_hashes'] += hashes
+        stats['total_seconds'] += seconds
+        stats['last_hashes'] = hashes
+        stats['last_seal_seconds'] = seconds
+        stats['last_hashes_per_second'] = hashes / seconds if seconds > 0 else 0.0
+        
+    def get_mining_stats(self) -> Dict[str, Any]:
+        """Mining-rate metrics: hashes per second and time to seal"""
+        stats = dict(self.mining_stats)
+        stats['difficulty'] = self.difficulty
+        stats['mining_workers'] = self.mining_workers
+        stats['hashes_per_second'] = (
+            stats['total_hashes'] / stats['total_seconds'] if stats['total_seconds'] > 0 else 0.0
+        )
+        return stats
+        
+    def _is_block_valid(self, block: Dict[str, Any], previous_block: Dict[str, Any]) -> bool:
+        """
+        Check a block's link to its predecessor, its hash and its Merkle root
+        The Merkle root is recomputed from the stored transactions rather than
+        taken from the cache, which would hide transactions edited after sealing
+        """
+        # Check hash integrity
+        if block['previous_hash'] != previous_block['hash']:
+            return False
+            
+        # Recalculate current block hash
+        if block['hash'] != self._hash_block(block):
+            return False
+            
+        # Verify Merkle root against the transactions as stored
+        if block['transactions']:
+            if MerkleTree(block['transactions']).get_root() != block['merkle_root']:
                 return False
                 
-            # Recalculate current block hash
-            current_block_hash = self._hash_block({
-                'index': current_block['index'],
-                'timestamp': current_block['timestamp'],
-                'transactions': current_block['transactions'],
-                'merkle_root': current_block['merkle_root'],
-                'previous_hash': current_block['previous_hash'],
-                'nonce': current_block['nonce']
-            })
+        return True
+        
+    def is_chain_valid(self, full: bool = False) -> bool:
+        """
+        Validate the blockchain
+        Checks hash integrity and Merkle roots. Routine checks resume after the
+        verified-height checkpoint, so only blocks sealed since the last check
+        are re-hashed. full=True re-verifies every block from genesis (audit mode)
+        Time Complexity: O(new blocks) routinely, O(chain) for a full audit
+        """
+        height = len(self.chain)
+        start = 1
+        if (not full and self.verified_height < height and
+                self.chain[self.verified_height]['hash'] == self.verified_tip_hash):
+            start = self.verified_height + 1
+        else:
+            self.verified_height = 0
+            self.verified_tip_hash = self.chain[0]['hash']
             
-            if current_block['hash'] != current_block_hash:
+        for i in range(start, height):
+            current_block = self.chain[i]
+            if not self._is_block_valid(current_block, self.chain[i-1]):
                 return False
-                
-            # Verify Merkle root
-            if current_block['transactions']:
-                tree = MerkleTree(current_block['transactions'])
-                if tree.get_root() != current_block['merkle_root']:
-                    return False
+            self.verified_height = i
+            self.verified_tip_hash = current_block['hash']
                     
         return True
         
+    def audit(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Full audit of the chain split into block ranges across a process pool
+        Moves the verified-height checkpoint to the audited tip on success
+        """
+        from .audit import audit_chain
+
+        height = len(self.chain)
+        tip_hash = self.chain[height - 1]['hash']
+        report = audit_chain(self.chain, workers=workers, height=height)
+        if report['valid']:
+            self.verified_height = height - 1
+            self.verified_tip_hash = tip_hash
+        else:
+            self.verified_height = 0
+            self.verified_tip_hash = self.chain[0]['hash']
+        return report
+        
     def get_transaction_proof(self, block_index: int, tx_index: int) -> Dict[str, Any]:
         """
         Get a proof for a specific transaction
@@ -343,12 +690,12 @@ class EnhancedBlockchain:
         if tx_index < 0 or tx_index >= len(block['transactions']):
             return None
             
-        # Create a Merkle tree for the block's transactions
-        tree = MerkleTree(block['transactions'])
+        # Reuse the block's cached Merkle tree instead of rebuilding it
+        tree = self.get_block_tree(block)
         
-        # Get the transaction and its hash
+        # Get the transaction and its hash (the tree's leaf)
         transaction = block['transactions'][tx_index]
-        tx_hash = hashlib.sha256(str(transaction).encode()).hexdigest()
+        tx_hash = tree.get_leaf(tx_index)
         
         # Get the proof
         proof = tree.get_proof(tx_index)
@@ -364,4 +711,32 @@ class EnhancedBlockchain:
     def verify_transaction(self, tx_hash: str, proof: List[Tuple[int, str]], root: str) -> bool:
         """Verify a transaction using its Merkle proof"""
         tree = MerkleTree([])  # Empty tree just to use the verification method
-        return tree.verify_proof(tx_hash, proof, root) 
\ No newline at end of file
+        return tree.verify_proof(tx_hash, proof, root)
+
+    def verify_receipt(self, receipt: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check a vote receipt against the chain
+        The Merkle path must lead from tx_hash to merkle_root, the block at
+        block_index must carry that hash and root, and tx_hash must be the
+        transaction indexed at (block_index, tx_index)
+        Time Complexity: O(log n) in the block's transaction count
+        """
+        try:
+            block_index = int(receipt['block_index'])
+            tx_index = int(receipt['tx_index'])
+            tx_hash = receipt['tx_hash']
+            block_hash = receipt['block_hash']
+            merkle_root = receipt['merkle_root']
+            proof = [(int(position), sibling) for position, sibling in receipt['merkle_proof']]
+        except (KeyError, TypeError, ValueError):
+            return {'valid': False, 'error': 'Malformed receipt'}
+
+        if not self.verify_transaction(tx_hash, proof, merkle_root):
+            return {'valid': False, 'error': 'Merkle path does not lead to the Merkle root'}
+        if self._lookup(self.block_locator, block_hash) != block_index:
+            return {'valid': False, 'error': 'Block is not on the chain'}
+        if self.chain[block_index]['merkle_root'] != merkle_root:
+            return {'valid': False, 'error': 'Merkle root does not match the block'}
+        if self.locate_transaction(tx_hash) != (block_index, tx_index):
+            return {'valid': False, 'error': 'Transaction is not in the block'}
+        return {'valid': True, 'error': None} 
\ No newline at end of file
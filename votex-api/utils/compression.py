@@ -0,0 +1,73 @@
+import gzip
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Request, Response
+
+try:
+    import brotli
+except ImportError:  # optional dependency; responses are gzip-compressed only
+    brotli = None
+
+# Content types worth compressing; images and archives already are
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+
+class ResponseCompressor:
+    """
+    Compress response bodies with brotli or gzip, as the client accepts
+    Only complete bodies of at least min_size bytes are compressed; streamed
+    responses such as the event stream and the ledger export are passed
+    through untouched, so their chunks are not held back by the compressor
+    """
+    def __init__(self, min_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings: Tuple[str, ...] = ('br', 'gzip') if brotli is not None else ('gzip',)
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def choose_encoding(self, request: Request) -> Optional[str]:
+        """Preferred encoding the client accepts, or None"""
+        accepted = request.accept_encodings
+        return next((encoding for encoding in self.encodings if accepted[encoding]), None)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    def __call__(self, request: Request, response: Response) -> Response:
+        """Compress a response in place; for use as an after_request hook"""
+        if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+        compressed = self.compress(body, encoding)
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        # The compressed bytes differ, so a strong validator becomes a weak one
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        self.compressed += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "encodings": list(self.encodings),
+            "min_size": self.min_size,
+            "compressed": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_out / self.bytes_in if self.bytes_in else None
+        }
@@ -1,13 +1,70 @@
-# In-memory data storage for the Votex API
+# Data storage for the Votex API
 
 from .blockchain import MerkleTree, ByzantineConsensus, EnhancedBlockchain
+from .block_builder import BlockBuilder
+from .ingest import VoteIngestor
+from .ledger import BlockLog
+from .snapshot import SnapshotStore
+from .storage import create_storage
+from .views import VoteView
+from .encoding import canonical_json
+from .tally import TallyEngine
+from .spent import SpentVoterIndex
+from .events import EventBroadcaster
+from .http_cache import FragmentCache, ResponseCache
+from .integrity import IntegrityMonitor
+from .compression import ResponseCompressor
+from .otp_store import OTPStore
+import hmac
+import os
+import threading
 import time
 
 # Initialize the enhanced blockchain
-blockchain = EnhancedBlockchain(consensus_nodes=7)  # 7 consensus nodes
+# With VOTEX_LEDGER_DIR set, blocks are persisted to an append-only on-disk log
+LEDGER_DIR = os.environ.get("VOTEX_LEDGER_DIR")
+MINING_DIFFICULTY = int(os.environ.get("VOTEX_MINING_DIFFICULTY", 1))
+MINING_WORKERS = int(os.environ.get("VOTEX_MINING_WORKERS", 1))
+blockchain = EnhancedBlockchain(
+    consensus_nodes=7,  # 7 consensus nodes
+    difficulty=MINING_DIFFICULTY,
+    mining_workers=MINING_WORKERS,
+    storage=BlockLog(LEDGER_DIR) if LEDGER_DIR else None
+)
 
-# Sample elections data
-elections = [
+# Votes are sealed in batches: a block is mined once BLOCK_MAX_TXS votes are
+# pending or the oldest pending vote has waited BLOCK_MAX_LATENCY seconds
+BLOCK_MAX_TXS = int(os.environ.get("VOTEX_BLOCK_MAX_TXS", 100))
+BLOCK_MAX_LATENCY = float(os.environ.get("VOTEX_BLOCK_MAX_LATENCY", 0.5))
+block_builder = BlockBuilder(blockchain, max_txs=BLOCK_MAX_TXS, max_latency=BLOCK_MAX_LATENCY, autostart=False)
+
+# Votes are written by a single writer thread draining a bounded queue; it
+# runs consensus and seals blocks through block_builder
+INGEST_QUEUE_SIZE = int(os.environ.get("VOTEX_INGEST_QUEUE_SIZE", 10000))
+INGEST_TIMEOUT = float(os.environ.get("VOTEX_INGEST_TIMEOUT", 5))
+vote_ingestor = VoteIngestor(block_builder, max_queue=INGEST_QUEUE_SIZE)
+
+# Snapshots of derived state let startup replay only the blocks sealed since
+SNAPSHOT_DIR = os.environ.get("VOTEX_SNAPSHOT_DIR") or (os.path.join(LEDGER_DIR, "snapshots") if LEDGER_DIR else None)
+SNAPSHOT_INTERVAL = int(os.environ.get("VOTEX_SNAPSHOT_INTERVAL", 100))
+snapshots = SnapshotStore(SNAPSHOT_DIR, interval_blocks=SNAPSHOT_INTERVAL) if SNAPSHOT_DIR else None
+
+# Ledger pagination: default and maximum number of votes per page
+VOTES_PAGE_SIZE = int(os.environ.get("VOTEX_VOTES_PAGE_SIZE", 100))
+VOTES_MAX_PAGE_SIZE = int(os.environ.get("VOTEX_VOTES_MAX_PAGE_SIZE", 1000))
+
+# Votes rendered when a live page loads; later votes are pushed over SSE
+LIVE_PAGE_VOTES = int(os.environ.get("VOTEX_LIVE_PAGE_VOTES", 200))
+
+# Largest number of votes accepted in one /api/votes/batch upload
+VOTES_BATCH_MAX = int(os.environ.get("VOTEX_VOTES_BATCH_MAX", 10000))
+
+# Polling station credentials accepted by /api/votes/batch, comma-separated;
+# batch uploads are refused while none are configured
+STATION_TOKENS = [token.strip() for token in os.environ.get("VOTEX_STATION_TOKENS", "").split(",") if token.strip()]
+
+# Sample elections data - seeded into storage
+sample_elections = [
     {
         "id": 1,
         "title": "Lok Sabha General Election 2025",
@@ -34,8 +91,8 @@ elections = [
     }
 ]
 
-# Sample candidates data
-candidates = {
+# Sample candidates data - seeded into storage
+sample_candidates = {
     1: [  # Presidential candidates (election_id: 1)
         {"id": 101, "name": "Aditya Kapoor", "party": "Bharatiya Janata Party", "bio": "Former Chief Minister"},
         {"id": 102, "name": "Sunita Verma", "party": "Indian National Congress", "bio": "Social Activist"},
@@ -53,23 +110,74 @@ candidates = {
     ]
 }
 
-# Sample voters data - will be populated with verified voters
-# Structure: {voter_id: {"name": "Full Name", "phone": "xxxx", "otp": 1234, "verified": True/False}}
-voters = {
-    "V12345": {"name": "Rahul Sharma", "phone": "1234567890", "otp": None, "verified": False},
-    "V67890": {"name": "Priya Patel", "phone": "9876543210", "otp": None, "verified": False},
-    "V54321": {"name": "Amit Kumar", "phone": "5551234567", "otp": None, "verified": False},
+# Sample voters data - seeded into the voter registry
+# Structure: (voter_id, name, phone)
+sample_voters = [
+    ("V12345", "Rahul Sharma", "1234567890"),
+    ("V67890", "Priya Patel", "9876543210"),
+    ("V54321", "Amit Kumar", "5551234567"),
     # Added these voters to ensure compatibility with frontend
-    "VOTER-2025-XXXX789": {"name": "Divya Singh", "phone": "1234567890", "otp": None, "verified": False},
-    "VOTER-2025-1234789": {"name": "Vikram Malhotra", "phone": "1234567890", "otp": None, "verified": False},
-    "VOTER-1": {"name": "Ananya Reddy", "phone": "1111111111", "otp": None, "verified": False},
-    "VOTER-2": {"name": "Suresh Iyer", "phone": "2222222222", "otp": None, "verified": False},
-    "TEST": {"name": "Neha Gupta", "phone": "0000000000", "otp": None, "verified": False}
-}
+    ("VOTER-2025-XXXX789", "Divya Singh", "1234567890"),
+    ("VOTER-2025-1234789", "Vikram Malhotra", "1234567890"),
+    ("VOTER-1", "Ananya Reddy", "1111111111"),
+    ("VOTER-2", "Suresh Iyer", "2222222222"),
+    ("TEST", "Neha Gupta", "0000000000")
+]
+
+# Elections, candidates, voters and votes: SQLite at VOTEX_DB, shared by every
+# worker process using the same file, otherwise in memory
+# Voters: {"name": "Full Name", "phone": "xxxx", "verified": True/False}; OTPs are kept in otp_store
+# Votes are claimed as they are accepted and written again, one transaction per
+# block, as their blocks are sealed
+# Claims stay pending until then, under the genesis hash of the chain they wait
+# for; restore_state releases the ones a crash kept off that chain
+CLAIM_OWNER = blockchain.chain[0]['hash']
+STARTED_AT = time.time()
+storage = create_storage(os.environ.get("VOTEX_DB") or os.environ.get("VOTEX_VOTER_DB"))
+for _election in sample_elections:
+    if storage.get_election(_election["id"]) is None:
+        storage.add_election(_election, sample_candidates.get(_election["id"], []))
+storage.voters.add_many(row for row in sample_voters if row[0] not in storage.voters)
+
+# Real-time vote counters, updated as blocks are sealed
+tally_engine = TallyEngine()
 
-# Votes storage - will be populated as votes are cast
-# Structure: {voter_id: {"election_id": x, "candidate_id": y}}
-votes = {}
+# Voters who have already voted, per election
+spent_voters = SpentVoterIndex()
+
+# Server-sent events pushed to live pages as blocks are sealed
+events = EventBroadcaster()
+
+# Background chain verification: incremental after every sealed block and a
+# full audit every VOTEX_INTEGRITY_AUDIT_INTERVAL seconds
+INTEGRITY_AUDIT_INTERVAL = float(os.environ.get("VOTEX_INTEGRITY_AUDIT_INTERVAL", 300))
+integrity_monitor = IntegrityMonitor(blockchain, audit_interval=INTEGRITY_AUDIT_INTERVAL)
+
+# Serialized bodies of read endpoints, dropped whenever a block is sealed
+response_cache = ResponseCache(max_entries=int(os.environ.get("VOTEX_RESPONSE_CACHE_SIZE", 256)))
+
+# Rendered vote markup of the HTML pages, one fragment per block
+fragment_cache = FragmentCache(max_entries=int(os.environ.get("VOTEX_FRAGMENT_CACHE_SIZE", 1024)))
+
+# JSON encoder of API responses: auto (orjson when installed), orjson or stdlib
+JSON_ENCODER = os.environ.get("VOTEX_JSON_ENCODER", "auto")
+
+# gzip (or brotli, when installed) compression of response bodies for clients that accept it
+COMPRESSION = os.environ.get("VOTEX_COMPRESSION", "1").lower() in ("1", "true", "yes")
+response_compressor = ResponseCompressor(min_size=int(os.environ.get("VOTEX_COMPRESS_MIN_BYTES", 1024)))
+
+# Outstanding OTPs, kept out of the voter records until they are verified
+otp_store = OTPStore(
+    ttl=float(os.environ.get("VOTEX_OTP_TTL", 300)),
+    max_attempts=int(os.environ.get("VOTEX_OTP_MAX_ATTEMPTS", 5)),
+    max_entries=int(os.environ.get("VOTEX_OTP_MAX_ENTRIES", 100000)),
+    lockout=float(os.environ.get("VOTEX_OTP_LOCKOUT", 900))
+)
+
+# How the last startup restored state from snapshots and the ledger
+startup_stats = {}
+_last_snapshot_height = 0
+_applied_height = 0  # highest block applied to the derived state
 
 # Helper functions to interact with data
 
@@ -77,44 +185,66 @@ def get_elections(status=None):
     """
     Get list of elections, optionally filtered by status
     """
-    if status:
-        return [election for election in elections if election["status"] == status]
-    return elections
+    return storage.get_elections(status or None)
+
+def get_election(election_id):
+    """
+    Get a single election, or None if there is no such election
+    """
+    return storage.get_election(int(election_id))
 
 def get_candidates(election_id):
     """
     Get candidates for a specific election
     """
-    election_id = int(election_id)
-    return candidates.get(election_id, [])
+    return storage.get_candidates(int(election_id))
 
 def get_voter(voter_id):
     """
     Get voter information
     """
-    return voters.get(voter_id)
+    return storage.voters.get(voter_id)
 
 def update_voter(voter_id, data):
     """
     Update voter information
     """
-    if voter_id in voters:
-        voters[voter_id].update(data)
-        return True
-    return False
+    return storage.voters.update(voter_id, data)
 
-def record_vote(voter_id, election_id, candidate_id):
+def record_vote(voter_id, election_id, candidate_id, wait=True):
     """
-    Record a vote and ensure it's added to the blockchain
+    Record a vote through the single-writer ingestion pipeline
+    
+    Args:
+        wait: block until the vote's block is sealed
     
     Returns:
-        bool: True if vote was recorded, False if voter already voted
-    """
-    election_id = int(election_id)
-    candidate_id = int(candidate_id)
+        bool: True if vote was recorded, False if voter already voted or
+            consensus rejected the vote
+        Future: with wait=False, resolves once the vote's block is sealed to
+            its receipt (tx hash, block location and Merkle path), to None if
+            consensus rejected it, or to False if the voter already voted
     
-    # Check if voter has already voted in this election
-    if voter_id in votes and election_id == votes[voter_id]["election_id"]:
+    Raises:
+        queue.Full: if the ingestion queue stays full for INGEST_TIMEOUT seconds
+    """
+    receipt = vote_ingestor.submit(_write_vote, voter_id, int(election_id), int(candidate_id),
+                                   timeout=INGEST_TIMEOUT)
+    if not wait:
+        return receipt
+    return bool(receipt.result())
+
+def _write_vote(voter_id, election_id, candidate_id):
+    """
+    Apply a vote on the writer thread
+    Returns the builder's seal receipt, or False if the voter already voted.
+    A vote rejected by consensus gets a receipt resolved to None, and its
+    spent mark and storage claim are released
+    """
+    # Check if voter has already voted in this election, marking them as
+    # having voted in the same step; the storage claim also catches votes
+    # accepted by other worker processes sharing the database
+    if not spent_voters.add(election_id, voter_id) or not storage.claim_votes([(voter_id, election_id, candidate_id)], CLAIM_OWNER)[0]:
         return False
     
     # Create a vote transaction
@@ -125,92 +255,467 @@ def record_vote(voter_id, election_id, candidate_id):
         "timestamp": time.time()
     }
     
-    # Add to blockchain using Byzantine consensus
-    if not blockchain.add_transaction(transaction):
+    # Add to the next block using Byzantine consensus
+    receipt = block_builder.submit(transaction)
+    if receipt.done() and receipt.result() is None:
+        # The vote is not on the chain, so the voter may vote again
         print(f"Warning: Transaction rejected by Byzantine consensus")
-        # For demo purposes, we'll still record it locally
-        
-    # Mine a new block to include this transaction
-    blockchain.mine_block()
+        _release_votes([(voter_id, election_id)])
+        return receipt
     
-    # Record the vote in local memory
-    votes[voter_id] = {"election_id": election_id, "candidate_id": candidate_id}
+    # The vote reaches storage once its block is sealed
     print(f"DEBUG: Vote recorded for {voter_id} in election {election_id} for candidate {candidate_id}")
-    print(f"DEBUG: Current votes: {votes}")
     
     # Mark the voter as verified
-    if voter_id in voters:
-        voters[voter_id]["verified"] = True
+    update_voter(voter_id, {"verified": True})
+    
+    return receipt
+
+def _release_votes(keys):
+    """Undo the spent marks and storage claims of (voter_id, election_id) votes rejected by consensus"""
+    for voter_id, election_id in keys:
+        spent_voters.discard(election_id, voter_id)
+    storage.release_votes(keys)
+
+def is_station_token(token):
+    """
+    Check a polling station credential against STATION_TOKENS
+    Every configured token is compared in constant time
+    """
+    if not token:
+        return False
+    matched = False
+    for station_token in STATION_TOKENS:
+        matched |= hmac.compare_digest(station_token.encode(), token.encode())
+    return matched
+
+def record_vote_batch(ballots):
+    """
+    Validate and record a batch of votes uploaded by a polling station
+    The batch is validated against the active elections and their candidates
+    in one pass, then written as a single ingestion task: one consensus round
+    and one sealed block. Voters must be registered; they were identified in
+    person at the station, so OTP verification is not required. Callers must
+    have authenticated the station with is_station_token
+    
+    Args:
+        ballots: list of {"voter_id", "election_id", "candidate_id"} dicts
     
+    Returns:
+        dict: per-ballot results in input order, with the same receipt
+            /api/vote returns for every recorded vote, and batch throughput stats
+    
+    Raises:
+        queue.Full: if the ingestion queue stays full for INGEST_TIMEOUT seconds
+    """
+    started = time.perf_counter()
+    
+    # Look up elections and candidates once for the whole batch
+    candidate_ids = {
+        election["id"]: {candidate["id"] for candidate in storage.get_candidates(election["id"])}
+        for election in storage.get_elections("active")
+    }
+    
+    results = [None] * len(ballots)
+    valid = []
+    for position, ballot in enumerate(ballots):
+        error = None
+        try:
+            voter_id = str(ballot["voter_id"])
+            election_id = int(ballot["election_id"])
+            candidate_id = int(ballot["candidate_id"])
+        except (KeyError, TypeError, ValueError):
+            error = "Missing or invalid voter_id, election_id or candidate_id"
+        else:
+            if election_id not in candidate_ids:
+                error = "Invalid or inactive election ID"
+            elif candidate_id not in candidate_ids[election_id]:
+                error = "Invalid candidate ID for this election"
+            elif voter_id not in storage.voters:
+                error = "Voter ID not found"
+        if error:
+            results[position] = {"index": position, "status": "invalid", "error": error}
+        else:
+            valid.append((position, voter_id, election_id, candidate_id))
+    
+    outcomes = []
+    if valid:
+        task = vote_ingestor.submit(_write_vote_batch, [ballot[1:] for ballot in valid], timeout=INGEST_TIMEOUT)
+        outcomes = [outcome if outcome is False else outcome.result() for outcome in task.result()]
+    
+    blocks = set()
+    for (position, voter_id, _, _), outcome in zip(valid, outcomes):
+        if outcome is False:
+            results[position] = {"index": position, "status": "duplicate",
+                                 "error": "Voter has already voted in this election"}
+        elif outcome is None:
+            results[position] = {"index": position, "status": "rejected",
+                                 "error": "Rejected by Byzantine consensus; the vote was not recorded and may be resubmitted"}
+        else:
+            blocks.add(outcome["block_index"])
+            results[position] = {
+                "index": position,
+                "status": "recorded",
+                "receipt": outcome
+            }
+        results[position]["voter_id"] = voter_id
+    
+    seconds = time.perf_counter() - started
+    recorded = sum(1 for result in results if result["status"] == "recorded")
+    return {
+        "results": results,
+        "stats": {
+            "received": len(ballots),
+            "recorded": recorded,
+            "invalid": sum(1 for result in results if result["status"] == "invalid"),
+            "duplicates": sum(1 for result in results if result["status"] == "duplicate"),
+            "rejected": sum(1 for result in results if result["status"] == "rejected"),
+            "blocks": sorted(blocks),
+            "seconds": seconds,
+            "votes_per_second": recorded / seconds if seconds > 0 else 0.0
+        }
+    }
+
+def _write_vote_batch(ballots):
+    """
+    Apply a batch of validated (voter_id, election_id, candidate_id) votes on
+    the writer thread and seal them into one block
+    Returns one seal Future or False (already voted) per ballot
+    """
+    # Duplicates within the batch are caught by the spent sets
+    fresh = [spent_voters.add(election_id, voter_id) for voter_id, election_id, _ in ballots]
+    # Claim the rest in one storage transaction, catching votes accepted by other workers
+    claims = iter(storage.claim_votes([ballot for ballot, new in zip(ballots, fresh) if new], CLAIM_OWNER))
+    
+    outcomes = []
+    transactions = []
+    now = time.time()
+    for (voter_id, election_id, candidate_id), new in zip(ballots, fresh):
+        if not (new and next(claims)):
+            outcomes.append(False)
+            continue
+        outcomes.append(None)
+        transactions.append({
+            "voter_id": voter_id,
+            "election_id": election_id,
+            "candidate_id": candidate_id,
+            "timestamp": now
+        })
+    
+    # One consensus round for the batch, sealed right away
+    receipts = block_builder.submit_many(transactions)
+    rejected = []
+    for transaction, receipt in zip(transactions, receipts):
+        if receipt.done() and receipt.result() is None:
+            rejected.append((transaction["voter_id"], transaction["election_id"]))
+        else:
+            # Mark the voter as verified, as _write_vote does
+            update_voter(transaction["voter_id"], {"verified": True})
+    # Rejected votes are not on the chain, so those voters may vote again
+    if rejected:
+        _release_votes(rejected)
+    receipts = iter(receipts)
+    outcomes = [next(receipts) if outcome is None else outcome for outcome in outcomes]
+    block_builder.seal()
+    return outcomes
+
+def _is_vote(tx):
+    """Whether a transaction is a vote"""
+    return all(k in tx for k in ['voter_id', 'election_id', 'candidate_id'])
+
+def _apply_block(block):
+    """
+    Apply the votes of a sealed block to the derived state
+    """
+    global _applied_height
+    _applied_height = max(_applied_height, block['index'])
+    storage.record_votes(
+        (tx['voter_id'], tx['election_id'], tx['candidate_id'])
+        for tx in block.get('transactions', []) if _is_vote(tx)
+    )
+    spent_voters.apply_block(block)
+    tally_engine.apply_block(block)
+
+def take_snapshot(background=False):
+    """
+    Snapshot the derived state at the current chain tip
+    
+    Args:
+        background: only copy the state here and leave sorting, reading the
+            stored votes, serializing and fsyncing to the snapshot writer thread
+    
+    Returns:
+        bool: False if a background snapshot was still being written, in
+            which case none is taken and the next sealed block tries again
+    """
+    global _last_snapshot_height
+    tip = blockchain.get_latest_block()
+    height = tip['index']
+    state = {
+        "height": height,
+        "tip_hash": tip['hash'],
+        "tip_header": {k: v for k, v in tip.items() if k != 'transactions'},
+        # Votes of later blocks may be read too; replaying those blocks records them again
+        "votes": storage.latest_votes,
+        "tallies": tally_engine.to_dict(),
+        "spent": spent_voters.copy_sets(),
+        "verified_height": blockchain.verified_height,
+        "verified_tip_hash": blockchain.verified_tip_hash
+    }
+    if background:
+        if not snapshots.save_in_background(state):
+            return False
+    else:
+        snapshots.save(state)
+    _last_snapshot_height = height
     return True
 
+def _on_block_sealed(block):
+    """
+    Keep derived state in step with the chain, push the block to live
+    viewers and snapshot state periodically
+    """
+    _apply_block(block)
+    response_cache.clear()
+    integrity_monitor.notify()
+    start = len(vote_view.votes)
+    if vote_view.apply_block(block):
+        new_votes = vote_view.votes[start:]
+    else:
+        new_votes = [_format_vote(block, block['index'], tx, tx_idx)
+                     for tx_idx, tx in enumerate(block['transactions']) if _is_vote(tx)]
+    _publish_block(block, new_votes)
+    if snapshots and snapshots.is_due(block['index'], _last_snapshot_height):
+        take_snapshot(background=True)
+
+def _publish_block(block, new_votes):
+    """
+    Push a sealed block to stream subscribers as a delta: its votes, the
+    tallies of the elections it touched and the chain status
+    """
+    election_ids = sorted({vote["election_id"] for vote in new_votes})
+    events.publish("block", {
+        "height": block['index'],
+        "hash": block['hash'],
+        "merkle_root": block['merkle_root'],
+        "timestamp": block['timestamp'],
+        "votes": new_votes,
+        "tallies": {str(election_id): tally_engine.results(election_id) for election_id in election_ids},
+        "total_votes": tally_engine.total_votes(),
+        "chain": {
+            "height": block['index'],
+            "valid": integrity_monitor.status()["valid"],
+            "merkle_root": block['merkle_root']
+        }
+    }, event_id=block['index'])
+
+def _on_integrity_checked(status):
+    """Push each verification result to stream subscribers"""
+    events.publish("integrity", status)
+
+integrity_monitor.add_listener(_on_integrity_checked)
+
+blockchain.add_seal_listener(_on_block_sealed)
+
+def restore_state():
+    """
+    Restore derived state at startup
+    Loads the latest snapshot that matches the ledger and replays only the
+    blocks sealed after it, so startup time is bounded by the snapshot interval
+    rather than the chain length. The locator indexes of the blocks up to the
+    snapshot are rebuilt on a background thread; lookups that miss wait for it
+    """
+    global _last_snapshot_height, _applied_height
+    started = time.perf_counter()
+    height = len(blockchain.chain)
+    snapshot = snapshots.load_latest() if snapshots else None
+    
+    # Blocks sealed in this process are already applied and indexed
+    start = _applied_height + 1
+    if (snapshot and start <= snapshot["height"] < height and
+            blockchain.chain[snapshot["height"]]['hash'] == snapshot["tip_hash"]):
+        storage.record_votes(
+            (voter_id, vote["election_id"], vote["candidate_id"]) for voter_id, vote in snapshot["votes"].items()
+        )
+        tally_engine.load(snapshot["tallies"])
+        spent_voters.load(snapshot["spent"])
+        blockchain.verified_height = snapshot["verified_height"]
+        blockchain.verified_tip_hash = snapshot["verified_tip_hash"]
+        # Locator indexes are not snapshotted; the blocks up to the snapshot
+        # are indexed in the background once startup is done
+        blockchain.defer_indexes(snapshot["height"])
+        _last_snapshot_height = _applied_height = snapshot["height"]
+        start = snapshot["height"] + 1
+    else:
+        snapshot = None
+    
+    for block_idx in range(start, height):
+        block = blockchain.chain[block_idx]
+        blockchain.index_block(block)
+        _apply_block(block)
+    
+    # Replaying confirmed every claim that reached the chain; claims made
+    # before this process started and still pending were lost in a crash
+    released_claims = storage.release_pending_votes(CLAIM_OWNER, STARTED_AT)
+    
+    if blockchain.deferred_height:
+        threading.Thread(target=blockchain.backfill_indexes, name="index-backfill", daemon=True).start()
+    
+    if snapshots and height - 1 > _last_snapshot_height:
+        take_snapshot()
+    
+    startup_stats.update({
+        "seconds": time.perf_counter() - started,
+        "chain_height": height - 1,
+        "snapshot_height": snapshot["height"] if snapshot else None,
+        "replayed_blocks": max(0, height - start),
+        "released_claims": released_claims
+    })
+    print(f"Startup: restored state at height {height - 1} in {startup_stats['seconds']:.3f}s "
+          f"({startup_stats['replayed_blocks']} blocks replayed)")
+    return startup_stats
+
+def get_metadata_version():
+    """
+    Version tag and modification time of the election and candidate data
+    """
+    return f"m{storage.metadata_version}", storage.metadata_changed_at
+
+def get_data_version():
+    """
+    Version tag and modification time of the data behind the ledger views
+    Changes whenever a block is sealed or election data is updated
+    """
+    tip = blockchain.get_latest_block()
+    return (f"m{storage.metadata_version}-b{tip['index']}-{tip['hash'][:16]}",
+            max(tip['timestamp'], storage.metadata_changed_at))
+
+def get_integrity_version():
+    """
+    Version tag and modification time of the ledger views that also show the
+    integrity status; changes after every verification run as well
+    """
+    tag, modified_at = get_data_version()
+    status = integrity_monitor.status()
+    return f"{tag}-i{status['runs']}", max(modified_at, status["last_run_at"] or 0)
+
+def get_integrity_status():
+    """
+    Status of the background verifier: validity, last verified height, last
+    run duration and the first invalid block if verification failed
+    Never waits on a verification run
+    """
+    return integrity_monitor.status()
+
 def get_vote_status(voter_id):
     """
     Get voting status for a voter
     """
-    if voter_id in votes:
+    vote = storage.get_vote(voter_id)
+    if vote:
         return {
             "voted": True,
-            "election_id": votes[voter_id]["election_id"]
+            "election_id": vote["election_id"],
+            "election_ids": spent_voters.elections_for(voter_id)
         }
     return {"voted": False}
 
-def get_all_votes():
+def _format_vote(block, block_idx, tx, tx_idx):
     """
-    Get all votes in a blockchain-friendly format with Merkle proofs
+    Format a vote transaction with its voter, election, candidate and block data
     """
-    blockchain_votes = []
+    # Get voter and election information
+    voter_id = tx['voter_id']
+    voter = get_voter(voter_id) or {}
+    election_id = tx['election_id']
+    candidate_id = tx['candidate_id']
     
-    # Process all blocks in the blockchain (except genesis block)
-    for block_idx in range(1, len(blockchain.chain)):
+    election = storage.get_election(election_id) or {}
+    candidate = storage.get_candidate(election_id, candidate_id) or {}
+    
+    # A Merkle proof has at least one sibling whenever the block holds more
+    # than one transaction, so there is no need to build the proof here
+    has_merkle_proof = len(block.get('transactions', [])) > 1
+    
+    # Format the vote with blockchain and Merkle tree data
+    return {
+        "voter_id": voter_id,
+        "voter_name": voter.get("name", "Unknown Voter"),
+        "voter_id_hash": hash(voter_id),  # Hashed for privacy
+        "timestamp": tx.get('timestamp', '2025-01-01T12:00:00Z'),
+        "election_id": election_id,
+        "election_name": election.get("title", "Unknown Election"),
+        "candidate_id": candidate_id,
+        "candidate_name": candidate.get("name", "Unknown Candidate"),
+        "block_hash": block.get('hash', ''),
+        "block_index": block_idx,
+        "tx_index": tx_idx,
+        "merkle_root": block.get('merkle_root', ''),
+        "has_merkle_proof": has_merkle_proof
+    }
+
+# Materialized view of enriched votes, appended to as blocks are sealed
+vote_view = VoteView(_format_vote)
+
+def get_voter_votes(voter_id):
+    """
+    Get a voter's votes from the blockchain through the voter index
+    Time Complexity: O(votes cast by the voter)
+    """
+    voter_votes = []
+    for block_idx, tx_idx in blockchain.locate_voter(voter_id):
         block = blockchain.chain[block_idx]
-        
-        # Process all transactions in the block
-        for tx_idx, tx in enumerate(block.get('transactions', [])):
-            # Skip non-vote transactions if any
-            if not all(k in tx for k in ['voter_id', 'election_id', 'candidate_id']):
-                continue
-                
-            # Get voter and election information
-            voter_id = tx['voter_id']
-            voter = get_voter(voter_id)
-            election_id = tx['election_id']
-            candidate_id = tx['candidate_id']
-            
-            election = next((e for e in elections if e["id"] == election_id), {})
-            candidate = next((c for c in candidates.get(election_id, []) 
-                            if c["id"] == candidate_id), {})
-            
-            # Get a Merkle proof for this transaction
-            proof_data = blockchain.get_transaction_proof(block_idx, tx_idx)
-            merkle_proof = proof_data.get('merkle_proof', []) if proof_data else []
-            
-            # Format the vote with blockchain and Merkle tree data
-            vote_data = {
-                "voter_id": voter_id,
-                "voter_name": voter.get("name", "Unknown Voter"),
-                "voter_id_hash": hash(voter_id),  # Hashed for privacy
-                "timestamp": tx.get('timestamp', '2025-01-01T12:00:00Z'),
-                "election_id": election_id,
-                "election_name": election.get("title", "Unknown Election"),
-                "candidate_id": candidate_id,
-                "candidate_name": candidate.get("name", "Unknown Candidate"),
-                "block_hash": block.get('hash', ''),
-                "block_index": block_idx,
-                "merkle_root": block.get('merkle_root', ''),
-                "has_merkle_proof": len(merkle_proof) > 0
-            }
-            
-            blockchain_votes.append(vote_data)
+        voter_votes.append(_format_vote(block, block_idx, block['transactions'][tx_idx], tx_idx))
+    return voter_votes
+
+def get_transaction(tx_hash):
+    """
+    Look up a transaction by hash
+    Returns the transaction with its block location, or None if unknown
+    """
+    location = blockchain.locate_transaction(tx_hash)
+    if location is None:
+        return None
+    block_idx, tx_idx = location
+    block = blockchain.chain[block_idx]
+    return {
+        "tx_hash": tx_hash,
+        "transaction": block['transactions'][tx_idx],
+        "block_index": block_idx,
+        "tx_index": tx_idx,
+        "block_hash": block['hash'],
+        "merkle_root": block['merkle_root']
+    }
+
+def get_block(hash_or_height):
+    """
+    Look up a block by hash or by height
+    Returns None if there is no such block
+    """
+    hash_or_height = str(hash_or_height)
+    # isdigit() also accepts digits int() rejects, such as superscripts
+    if hash_or_height.isascii() and hash_or_height.isdecimal():
+        height = int(hash_or_height)
+        return blockchain.chain[height] if height < len(blockchain.chain) else None
+    return blockchain.get_block_by_hash(hash_or_height)
+
+def get_all_votes():
+    """
+    Get all votes in a blockchain-friendly format with Merkle proofs
+    The returned list is shared with the view and must not be modified
+    """
+    # Served from the materialized view; only blocks sealed since the last
+    # call (normally none) are formatted here
+    blockchain_votes = vote_view.sync(blockchain.chain)
     
-    # If blockchain is empty, fall back to memory-stored votes
+    # If blockchain is empty, fall back to the votes in storage
     if not blockchain_votes:
-        for voter_id, vote_data in votes.items():
+        blockchain_votes = []
+        for voter_id, vote_data in storage.latest_votes().items():
             # Get voter and election information
-            voter = get_voter(voter_id)
-            election = next((e for e in elections if e["id"] == vote_data["election_id"]), {})
-            candidate = next((c for c in candidates.get(vote_data["election_id"], []) 
-                            if c["id"] == vote_data["candidate_id"]), {})
+            voter = get_voter(voter_id) or {}
+            election = storage.get_election(vote_data["election_id"]) or {}
+            candidate = storage.get_candidate(vote_data["election_id"], vote_data["candidate_id"]) or {}
             
             blockchain_votes.append({
                 "voter_id": voter_id,
@@ -227,12 +732,142 @@ def get_all_votes():
     
     return blockchain_votes
 
-def verify_blockchain_integrity():
+def get_votes_at_height():
+    """
+    Get the votes of the chain together with the height they cover
+    Returns (votes, count, height): the first count votes of the shared list
+    are the votes of blocks up to height, read in one step, so a page
+    rendered from them can resume the event stream after exactly that height
+    """
+    votes, count, height = vote_view.sync_snapshot(blockchain.chain)
+    if not count:
+        votes = get_all_votes()
+        count = len(votes)
+    return votes, count, height
+
+def get_results(election_id):
+    """
+    Get the live vote counts for an election with candidate details
+    Time Complexity: O(candidates), independent of the number of votes
+    """
+    election_id = int(election_id)
+    tally = tally_engine.results(election_id)
+    results = [
+        {
+            "candidate_id": candidate["id"],
+            "name": candidate["name"],
+            "party": candidate["party"],
+            "votes": tally["counts"].get(candidate["id"], 0)
+        }
+        for candidate in storage.get_candidates(election_id)
+    ]
+    return {
+        "election_id": election_id,
+        "election_name": (storage.get_election(election_id) or {}).get("title", "Unknown Election"),
+        "total_votes": tally["total_votes"],
+        "block_height": tally["height"],
+        "results": results
+    }
+
+def check_tally_consistency():
+    """
+    Compare the live counters against a full recount of the chain
+    """
+    return tally_engine.check_consistency(blockchain.chain)
+
+def encode_cursor(key):
+    """Encode a (block_index, tx_index) key as a pagination cursor"""
+    return f"{key[0]}:{key[1]}" if key else None
+
+def decode_cursor(cursor):
+    """
+    Decode a pagination cursor into a (block_index, tx_index) key
+    Raises ValueError for a malformed cursor
+    """
+    block_idx, tx_idx = cursor.split(":")
+    return int(block_idx), int(tx_idx)
+
+def get_votes_page(cursor=None, limit=None, election_id=None, from_block=None,
+                   to_block=None, since=None, until=None):
+    """
+    Get one page of votes, ordered by block and transaction index
+    
+    Args:
+        cursor: cursor returned with the previous page
+        limit: votes per page, capped at VOTES_MAX_PAGE_SIZE
+        election_id, from_block, to_block: optional filters
+        since, until: optional Unix timestamp bounds on the sealing block
+    
+    Returns:
+        dict: the votes, the cursor of the next page (None on the last page)
+            and the total number of votes in the ledger
+    
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    limit = min(max(1, limit or VOTES_PAGE_SIZE), VOTES_MAX_PAGE_SIZE)
+    after = decode_cursor(cursor) if cursor else None
+    vote_view.sync(blockchain.chain)
+    page, next_key = vote_view.page(
+        after=after, limit=limit, election_id=election_id, from_block=from_block,
+        to_block=to_block, since=since, until=until
+    )
+    return {
+        "votes": page,
+        "next_cursor": encode_cursor(next_key),
+        "limit": limit,
+        "total_votes": len(vote_view.votes)
+    }
+
+def iter_ledger_export(from_height=0, to_height=None):
+    """
+    Yield the ledger as NDJSON, one canonical JSON block per line
+    Blocks are read one at a time (straight from the block log when the chain
+    is persisted), so memory use does not depend on the chain length
+    """
+    to_height = len(blockchain.chain) if to_height is None else to_height
+    if isinstance(blockchain.chain, BlockLog):
+        for raw_block in blockchain.chain.iter_raw(from_height, to_height):
+            yield raw_block + b"\n"
+    else:
+        for height in range(from_height, to_height):
+            yield canonical_json(blockchain.chain[height]) + b"\n"
+
+def verify_receipt(receipt):
+    """
+    Check a vote receipt returned by /api/vote against the chain
+    Time Complexity: O(log n) in the block's transaction count
+    """
+    return blockchain.verify_receipt(receipt)
+
+def verify_blockchain_integrity(full=False):
     """
     Verify the integrity of the blockchain
+    Only blocks sealed since the last check are verified unless full is set,
+    which re-verifies the whole chain from genesis
     Returns True if valid, False if invalid
     """
-    return blockchain.is_chain_valid()
+    if full:
+        return audit_blockchain()['valid']
+    return integrity_monitor.check()
+
+def audit_blockchain(workers=None):
+    """
+    Run a full parallel audit of the blockchain
+    Returns a report with the first invalid block index and per-range timing
+    """
+    return integrity_monitor.audit(workers=workers)
+
+def get_mining_stats():
+    """
+    Get mining-rate metrics for the blockchain
+    Includes hashes per second, time to seal and the batching latency
+    """
+    stats = blockchain.get_mining_stats()
+    stats["blocks_sealed"] = block_builder.blocks_sealed
+    stats["last_seal_latency"] = block_builder.last_seal_latency
+    stats["ingestion"] = vote_ingestor.stats()
+    return stats
 
 def get_merkle_root():
     """Get the current Merkle root of the last block"""
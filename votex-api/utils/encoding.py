@@ -0,0 +1,81 @@
+import hashlib
+import json
+import struct
+from typing import Any, Dict
+
+# Block header: index, timestamp and transaction count, followed by the
+# length-prefixed Merkle root and previous hash. The transactions themselves
+# are committed to through the Merkle root, which validation recomputes
+_BLOCK_HEADER = struct.Struct('>qdq')
+
+# Vote transactions: a tag byte, election id, candidate id and timestamp,
+# followed by the UTF-8 voter id
+_VOTE = struct.Struct('>Bqqd')
+VOTE_FIELDS = frozenset(('voter_id', 'election_id', 'candidate_id', 'timestamp'))
+VOTE_TAG = 1
+# Other transactions are tagged canonical JSON, so the two layouts never collide
+JSON_TAG = b'\x00'
+
+_NONCE = struct.Struct('>Q')
+
+# Reused encoder instance; json.dumps builds a new one on every call
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def canonical_json(data: Any) -> bytes:
+    """
+    Encode data as canonical JSON bytes
+    Keys are sorted and separators compact, so the same value always encodes
+    to the same bytes regardless of dict insertion order or process
+    """
+    return _ENCODER.encode(data).encode('utf-8')
+
+
+def sha256(data: bytes) -> bytes:
+    """Raw SHA-256 digest of some bytes"""
+    return hashlib.sha256(data).digest()
+
+
+def encode_transaction(transaction: Dict[str, Any]) -> bytes:
+    """
+    Canonical bytes of a transaction, as hashed into Merkle leaves
+    Vote transactions use the fixed binary layout; anything else, including
+    votes with unexpected field types, falls back to canonical JSON
+    """
+    if transaction.keys() == VOTE_FIELDS:
+        voter_id = transaction['voter_id']
+        if type(voter_id) is str:
+            try:
+                return _VOTE.pack(
+                    VOTE_TAG, transaction['election_id'], transaction['candidate_id'], transaction['timestamp']
+                ) + voter_id.encode('utf-8')
+            except struct.error:
+                pass
+    return JSON_TAG + canonical_json(transaction)
+
+
+def _encode_str(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return struct.pack('>H', len(data)) + data
+
+
+def encode_block(block: Dict[str, Any]) -> bytes:
+    """Canonical bytes of a block header without its nonce and hash"""
+    return (
+        _BLOCK_HEADER.pack(block['index'], block['timestamp'], len(block['transactions']))
+        + _encode_str(block['merkle_root'])
+        + _encode_str(block['previous_hash'])
+    )
+
+
+def encode_nonce(nonce: int) -> bytes:
+    """Fixed-width big-endian encoding of a proof of work nonce"""
+    return _NONCE.pack(nonce)
+
+
+def hash_block(block: Dict[str, Any]) -> str:
+    """
+    Hex SHA-256 of a block
+    The preimage is the canonical block encoding followed by the 8-byte nonce
+    """
+    return hashlib.sha256(encode_block(block) + encode_nonce(block['nonce'])).hexdigest()
@@ -0,0 +1,93 @@
+import queue
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, Optional, Set, Tuple
+
+from .encoding import canonical_json
+
+RESET_MESSAGE = b"event: reset\ndata: {}\n\n"
+
+
+class EventBroadcaster:
+    """
+    Fan-out of server-sent events to any number of subscribers
+    Each event is serialized once when it is published and the same bytes are
+    queued for every subscriber, so a new block costs one queue put per viewer
+    rather than a page render. Recent events are kept so a reconnecting client
+    can resume from its Last-Event-ID; a client that has fallen too far behind
+    gets a reset event and should reload
+    """
+    def __init__(self, history: int = 256, max_pending: int = 256, heartbeat: float = 15.0):
+        self.history: Deque[Tuple[int, bytes]] = deque(maxlen=history)
+        self.max_pending = max_pending
+        self.heartbeat = heartbeat
+        self.lock = threading.Lock()
+        self.subscribers: Set[queue.Queue] = set()
+        self.published = 0
+
+    def publish(self, event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> None:
+        """
+        Send an event to every subscriber; event ids must increase
+        Events without an id are not kept for replay
+        """
+        message = b"event: %s\ndata: %s\n\n" % (event.encode('utf-8'), canonical_json(data))
+        if event_id is not None:
+            message = b"id: %d\n" % event_id + message
+        with self.lock:
+            if event_id is not None:
+                self.history.append((event_id, message))
+            self.published += 1
+            for subscriber in self.subscribers:
+                _offer(subscriber, message)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> queue.Queue:
+        """
+        Register a subscriber, replaying the events after last_event_id
+        Returns the queue its messages are delivered on
+        """
+        subscriber = queue.Queue(maxsize=self.max_pending)
+        with self.lock:
+            if last_event_id is not None:
+                missed = [message for event_id, message in self.history if event_id > last_event_id]
+                if self.history and self.history[0][0] > last_event_id + 1:
+                    # Some of the missed events are no longer in the history
+                    missed = [RESET_MESSAGE]
+                for message in missed:
+                    _offer(subscriber, message)
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def stream(self, subscriber: queue.Queue) -> Iterator[bytes]:
+        """Yield a subscriber's messages as a text/event-stream body"""
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    yield subscriber.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    # Comment line that keeps proxies from closing an idle stream
+                    yield b": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "subscribers": len(self.subscribers),
+                "published": self.published,
+                "last_event_id": self.history[-1][0] if self.history else None
+            }
+
+
+def _offer(subscriber: queue.Queue, message: bytes) -> None:
+    """Queue a message, replacing a full backlog with a reset event"""
+    try:
+        subscriber.put_nowait(message)
+    except queue.Full:
+        with subscriber.mutex:
+            subscriber.queue.clear()
+        subscriber.put_nowait(RESET_MESSAGE)
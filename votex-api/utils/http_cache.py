@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Response, make_response, request
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialized GET responses
+    Entries are keyed by data version and URL, so a body is reused only while
+    the data it was rendered from is unchanged; clear() drops everything when
+    a new block is sealed
+    Time Complexity: O(1) lookup, insertion and eviction
+    """
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bytes, int, str]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[bytes, int, str]]:
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[str, str], entry: Tuple[bytes, int, str]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class FragmentCache(ResponseCache):
+    """
+    Bounded LRU cache of rendered HTML fragments, keyed by template and block hash
+    Blocks are immutable once sealed, so a fragment stays valid for as long as
+    the block is on the chain and sealing a block only adds fragments. The
+    block hash covers the votes only through the Merkle root, so tampering
+    with stored votes is caught by the integrity checks, not by this cache
+    """
+    def __init__(self, max_entries: int = 1024):
+        super().__init__(max_entries)
+        self.renders = 0
+        self.render_seconds = 0.0
+        self.last_render_seconds = 0.0
+
+    def record_render(self, seconds: float) -> None:
+        """Count a page render and its duration"""
+        with self.lock:
+            self.renders += 1
+            self.render_seconds += seconds
+            self.last_render_seconds = seconds
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        del stats["not_modified"]
+        stats.update({
+            "renders": self.renders,
+            "last_render_seconds": self.last_render_seconds,
+            "mean_render_seconds": self.render_seconds / self.renders if self.renders else 0.0
+        })
+        return stats
+
+
+def conditional_get(cache: ResponseCache, version: Callable[[], Tuple[str, float]]):
+    """
+    Decorate a GET view with ETag / Last-Modified validation and response caching
+    version() returns the current data version tag and its modification time.
+    Requests whose If-None-Match (or, without one, If-Modified-Since) matches
+    get a 304 without running the view; other 200 responses are served from
+    the cache until the version changes. Last-Modified has one-second
+    resolution and blocks are sealed more often than that, so it is only
+    sent, and If-Modified-Since only honored, once the second of the last
+    change is over; any later change then falls in a later second
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            tag, modified_at = version()
+            last_modified = datetime.fromtimestamp(int(modified_at), tz=timezone.utc)
+            settled = time.time() >= int(modified_at) + 1
+
+            if request.if_none_match:
+                # Weak comparison, as compressed responses carry the tag as a weak validator
+                unchanged = request.if_none_match.contains_weak(tag)
+            else:
+                unchanged = (settled and request.if_modified_since is not None
+                             and last_modified <= request.if_modified_since)
+            if unchanged:
+                cache.not_modified += 1
+                response = Response(status=304)
+            else:
+                key = (tag, request.full_path)
+                entry = cache.get(key)
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    cache.put(key, (response.get_data(), response.status_code, response.mimetype))
+                    response.headers["X-Cache"] = "MISS"
+                else:
+                    body, status, mimetype = entry
+                    response = Response(body, status=status, mimetype=mimetype)
+                    response.headers["X-Cache"] = "HIT"
+
+            response.set_etag(tag)
+            if settled:
+                response.last_modified = last_modified
+            # Clients may keep the body but must revalidate before reusing it
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
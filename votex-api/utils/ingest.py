@@ -0,0 +1,97 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+
+class VoteIngestor:
+    """
+    Single-writer ingestion pipeline
+    Request threads submit write tasks to a bounded queue and wait on a Future;
+    one writer thread runs the tasks in order and seals blocks through the block
+    builder, so shared chain and vote state is only ever mutated by that thread.
+    A task may return a Future (e.g. the builder's seal receipt), in which case
+    the caller's Future resolves once that one does
+    """
+    def __init__(self, builder, max_queue: int = 10000):
+        self.builder = builder
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.max_queue = max_queue
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+
+    def submit(self, task: Callable[..., Any], *args, timeout: Optional[float] = None) -> Future:
+        """
+        Queue a write task for the writer thread
+        Raises queue.Full if the queue stays full for timeout seconds
+        """
+        future = Future()
+        self._start()
+        self.queue.put((task, args, future), timeout=timeout)
+        self.submitted += 1
+        return future
+
+    def _start(self) -> None:
+        """Start the writer thread on first use"""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self.started_at = time.monotonic()
+                    self._thread = threading.Thread(target=self._run, name="vote-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        """Run queued tasks and seal blocks when the builder's thresholds are hit"""
+        while True:
+            try:
+                item = self.queue.get(timeout=self.builder.seconds_until_due())
+            except queue.Empty:
+                self._seal()
+                continue
+            self._execute(*item)
+            if self.builder.seconds_until_due() == 0:
+                self._seal()
+
+    def _execute(self, task: Callable[..., Any], args: tuple, future: Future) -> None:
+        try:
+            result = task(*args)
+        except Exception as exc:
+            self.failed += 1
+            future.set_exception(exc)
+            return
+        self.processed += 1
+        if isinstance(result, Future):
+            result.add_done_callback(lambda done: _resolve(future, done))
+        else:
+            future.set_result(result)
+
+    def _seal(self) -> None:
+        try:
+            self.builder.seal()
+        except Exception as exc:
+            print(f"Warning: Failed to seal block: {exc}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and throughput of the pipeline"""
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "queued": self.queue.qsize(),
+            "max_queue": self.max_queue,
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "processed_per_second": self.processed / elapsed if elapsed > 0 else 0.0
+        }
+
+
+def _resolve(future: Future, done: Future) -> None:
+    """Settle future with the outcome of done"""
+    if done.exception() is not None:
+        future.set_exception(done.exception())
+    else:
+        future.set_result(done.result())
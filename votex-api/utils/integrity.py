@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+def clamp_workers(workers: Optional[int]) -> Optional[int]:
+    """Keep an audit worker count within 1..cpu_count; None stays None (one per CPU)"""
+    if workers is None:
+        return None
+    return max(1, min(workers, os.cpu_count() or 1))
+
+
+class IntegrityMonitor:
+    """
+    Background verifier of the chain with a cached status
+    A worker thread verifies newly sealed blocks incrementally whenever it is
+    notified and runs a full audit every audit_interval seconds. Readers get the
+    status of the last run from status() without waiting on a verification
+    """
+    def __init__(self, blockchain, audit_interval: float = 300.0, workers: Optional[int] = None):
+        self.blockchain = blockchain
+        self.audit_interval = audit_interval
+        self.workers = workers
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Serializes runs, which move the blockchain's verified-height checkpoint
+        self.run_lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._check_pending = True
+        self._audit_pending = False
+        self._audit_workers: Optional[int] = None
+        self._last_report: Optional[Dict[str, Any]] = None
+        self._next_audit = time.monotonic() + audit_interval
+        self._thread: Optional[threading.Thread] = None
+        self._status: Dict[str, Any] = {
+            "valid": None,
+            "mode": None,
+            "verified_height": blockchain.verified_height,
+            "chain_height": len(blockchain.chain) - 1,
+            "first_invalid_index": None,
+            "last_run_seconds": None,
+            "last_run_at": None,
+            "last_full_audit_at": None,
+            "last_full_audit_seconds": None,
+            "runs": 0
+        }
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callback that receives the status after every run"""
+        self.listeners.append(listener)
+
+    def status(self) -> Dict[str, Any]:
+        """Status of the last verification run"""
+        with self._changed:
+            return dict(self._status)
+
+    def notify(self) -> None:
+        """Ask for an incremental check of blocks sealed since the last run"""
+        with self._changed:
+            self._check_pending = True
+            self._changed.notify()
+
+    def last_report(self) -> Optional[Dict[str, Any]]:
+        """Report of the last full audit, with per-range timing, or None before the first"""
+        with self._changed:
+            return self._last_report
+
+    def request_audit(self, workers: Optional[int] = None) -> None:
+        """
+        Ask for a full audit as soon as the worker is free
+        workers is clamped to 1..cpu_count; by default the monitor's own setting is used
+        """
+        with self._changed:
+            self._audit_pending = True
+            self._audit_workers = clamp_workers(workers) if workers is not None else None
+            self._changed.notify()
+
+    def check(self) -> bool:
+        """
+        Verify the blocks sealed since the last checkpoint
+        Time Complexity: O(new blocks)
+        """
+        with self.run_lock:
+            started = time.perf_counter()
+            valid = self.blockchain.is_chain_valid()
+            # A failed check leaves the checkpoint on the last good block
+            first_invalid = None if valid else self.blockchain.verified_height + 1
+            self._record("incremental", valid, first_invalid, time.perf_counter() - started)
+        return valid
+
+    def audit(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Re-verify the whole chain across a process pool
+        Time Complexity: O(chain)
+        """
+        with self.run_lock:
+            report = self.blockchain.audit(workers=clamp_workers(workers or self.workers))
+            with self._changed:
+                self._last_report = report
+            self._record("full", report['valid'], report['first_invalid_index'], report['seconds'])
+        return report
+
+    def start(self) -> None:
+        """Start the worker thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="integrity-monitor", daemon=True)
+            self._thread.start()
+
+    def _record(self, mode: str, valid: bool, first_invalid: Optional[int], seconds: float) -> None:
+        with self._changed:
+            self._status.update({
+                "valid": valid,
+                "mode": mode,
+                "verified_height": self.blockchain.verified_height,
+                "chain_height": len(self.blockchain.chain) - 1,
+                "first_invalid_index": first_invalid,
+                "last_run_seconds": seconds,
+                "last_run_at": time.time(),
+                "runs": self._status["runs"] + 1
+            })
+            if mode == "full":
+                self._status["last_full_audit_at"] = self._status["last_run_at"]
+                self._status["last_full_audit_seconds"] = seconds
+            status = dict(self._status)
+        for listener in self.listeners:
+            try:
+                listener(status)
+            except Exception as exc:
+                print(f"Warning: Integrity listener failed: {exc}")
+
+    def _run(self) -> None:
+        """Run pending checks, and the scheduled audit when it is due"""
+        while True:
+            with self._changed:
+                while not (self._check_pending or self._audit_pending):
+                    timeout = self._next_audit - time.monotonic()
+                    if timeout <= 0:
+                        self._audit_pending = True
+                        break
+                    self._changed.wait(timeout)
+                audit = self._audit_pending
+                workers = self._audit_workers
+                self._check_pending = self._audit_pending = False
+                self._audit_workers = None
+            try:
+                if audit:
+                    self._next_audit = time.monotonic() + self.audit_interval
+                    self.audit(workers)
+                else:
+                    self.check()
+            except Exception as exc:
+                print(f"Warning: Integrity verification failed to run: {exc}")
@@ -0,0 +1,72 @@
+from typing import Any, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency; the standard library encoder is used instead
+    orjson = None
+
+
+def resolve_encoder(name: Optional[str] = None) -> str:
+    """
+    Name of the encoder to use for a configured name
+    "auto" (or no name) picks orjson when it is installed; asking for an
+    encoder that is not installed falls back to the standard library
+    """
+    name = (name or "auto").lower()
+    if name not in ("auto", "orjson", "stdlib"):
+        raise ValueError(f"Unknown JSON encoder: {name}")
+    if name == "stdlib" or orjson is None:
+        return "stdlib"
+    return "orjson"
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson when it is available
+    Output matches the default provider: keys are sorted, so equal data gives
+    equal bodies and ETags, and dates, UUIDs, dataclasses and Decimals go
+    through the same default() hook. orjson writes UTF-8 rather than
+    escaping non-ASCII characters. Anything orjson rejects, such as integers
+    wider than 64 bits, is retried with the standard library encoder
+    """
+    def __init__(self, app, encoder: Optional[str] = None):
+        super().__init__(app)
+        self.encoder = resolve_encoder(encoder)
+
+    def _options(self, indent: bool = False) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """Serialize data as compact (or indented) UTF-8 JSON bytes"""
+        if self.encoder == "orjson":
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._options(indent))
+            except TypeError:
+                pass
+        if indent:
+            return super().dumps(obj, indent=2).encode('utf-8')
+        return super().dumps(obj, separators=(",", ":")).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Keyword arguments only exist for json.dumps, so honor them with it
+        if kwargs or self.encoder != "orjson":
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs or self.encoder != "orjson":
+            return super().loads(s, **kwargs)
+        # orjson.JSONDecodeError is a ValueError, so Flask still answers bad bodies with 400
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,246 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; the writer lock is skipped there
+    fcntl = None
+
+from .encoding import canonical_json
+
+# Record header: payload length and CRC32 of the payload
+_RECORD = struct.Struct('>II')
+# Index entry: segment number, record offset in the segment, payload length
+_ENTRY = struct.Struct('>IQI')
+
+INDEX_FILE = 'blocks.idx'
+LOCK_FILE = 'writer.lock'
+SEGMENT_PATTERN = 'segment-{:06d}.log'
+
+
+class BlockLog:
+    """
+    Append-only, segmented on-disk block log with a memory-mapped offset index
+    Blocks are stored as CRC-checked canonical JSON records in segment files;
+    a fixed-width index maps each height to its record, so reading a block by
+    height is O(1). It behaves like the in-memory chain list (len, indexing,
+    iteration, append) so EnhancedBlockchain can run on top of it. Only one
+    process may have a log open for writing; a second writer fails on open
+    """
+    def __init__(self, path: str, segment_bytes: int = 64 * 1024 * 1024,
+                 fsync: bool = True, readonly: bool = False):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.readonly = readonly
+        self.lock = threading.RLock()
+        self._segments = {}
+        self._index_map = None
+        self._mapped_count = 0
+        self._tip = None
+        self._lock_file = None
+
+        if not readonly:
+            os.makedirs(path, exist_ok=True)
+            self._lock_writer()
+        index_path = os.path.join(path, INDEX_FILE)
+        if not readonly and not os.path.exists(index_path):
+            open(index_path, 'wb').close()
+        self._index_file = open(index_path, 'rb' if readonly else 'r+b')
+        self._count = os.path.getsize(index_path) // _ENTRY.size
+
+        if not readonly:
+            self.recover()
+
+    def _lock_writer(self) -> None:
+        """Take the log's exclusive writer lock, held until close or process exit"""
+        if fcntl is None:
+            return
+        self._lock_file = open(os.path.join(self.path, LOCK_FILE), 'a')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            raise IOError(f'block log {self.path} is already open for writing by another process')
+
+    # Recovery
+
+    def recover(self) -> int:
+        """
+        Bring the index and segments back in line after a crash
+        Drops a partially written index entry, re-indexes complete records that
+        were written after the last index entry, and truncates a torn tail
+        Returns the number of records re-indexed
+        """
+        with self.lock:
+            self._index_file.truncate(self._count * _ENTRY.size)
+
+            # Drop index entries whose records did not make it to disk
+            while self._count:
+                segment, offset, length = self._entry(self._count - 1)
+                segment_path = self._segment_path(segment)
+                if os.path.exists(segment_path) and os.path.getsize(segment_path) >= offset + _RECORD.size + length:
+                    break
+                self._count -= 1
+                self._index_file.truncate(self._count * _ENTRY.size)
+
+            if self._count:
+                segment, offset, length = self._entry(self._count - 1)
+                position = offset + _RECORD.size + length
+            else:
+                segment, position = 0, 0
+
+            # Re-index complete records past the last entry, truncate the first torn one
+            recovered = 0
+            while os.path.exists(self._segment_path(segment)):
+                with open(self._segment_path(segment), 'r+b') as handle:
+                    handle.seek(position)
+                    while True:
+                        header = handle.read(_RECORD.size)
+                        if not header:
+                            break
+                        payload = b''
+                        if len(header) == _RECORD.size:
+                            length, checksum = _RECORD.unpack(header)
+                            payload = handle.read(length)
+                        if len(header) < _RECORD.size or len(payload) < length or zlib.crc32(payload) != checksum:
+                            handle.truncate(position)
+                            self._remove_segments_after(segment)
+                            self._remap()
+                            return recovered
+                        self._write_entry(segment, position, length)
+                        position += _RECORD.size + length
+                        recovered += 1
+                segment += 1
+                position = 0
+
+            self._remap()
+            return recovered
+
+    def _remove_segments_after(self, segment: int) -> None:
+        """Delete segments following a truncated one"""
+        segment += 1
+        while os.path.exists(self._segment_path(segment)):
+            os.remove(self._segment_path(segment))
+            segment += 1
+
+    # Index
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, SEGMENT_PATTERN.format(segment))
+
+    def _remap(self) -> None:
+        """Map the index file into memory, picking up entries appended since"""
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        self._index_file.flush()
+        if self._count:
+            self._index_map = mmap.mmap(self._index_file.fileno(), self._count * _ENTRY.size,
+                                        access=mmap.ACCESS_READ)
+        self._mapped_count = self._count
+
+    def _entry(self, height: int):
+        """Read the (segment, offset, length) index entry for a height"""
+        if height < self._mapped_count:
+            return _ENTRY.unpack_from(self._index_map, height * _ENTRY.size)
+        self._index_file.seek(height * _ENTRY.size)
+        return _ENTRY.unpack(self._index_file.read(_ENTRY.size))
+
+    def _write_entry(self, segment: int, offset: int, length: int) -> None:
+        self._index_file.seek(self._count * _ENTRY.size)
+        self._index_file.write(_ENTRY.pack(segment, offset, length))
+        self._count += 1
+
+    # Reads
+
+    def _segment(self, segment: int):
+        handle = self._segments.get(segment)
+        if handle is None:
+            handle = open(self._segment_path(segment), 'rb')
+            self._segments[segment] = handle
+        return handle
+
+    def read_raw(self, height: int) -> bytes:
+        """Read the stored canonical JSON bytes of a block"""
+        with self.lock:
+            if height >= self._mapped_count:
+                self._remap()
+            segment, offset, length = self._entry(height)
+            handle = self._segment(segment)
+            handle.seek(offset + _RECORD.size)
+            return handle.read(length)
+
+    def iter_raw(self, start: int = 0, stop: Optional[int] = None) -> Iterator[bytes]:
+        """Iterate the stored bytes of blocks in [start, stop)"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for height in range(start, stop):
+            yield self.read_raw(height)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, height: int) -> Dict[str, Any]:
+        if height < 0:
+            height += self._count
+        if height < 0 or height >= self._count:
+            raise IndexError('block height out of range')
+        if height == self._count - 1:
+            if self._tip is None:
+                self._tip = json.loads(self.read_raw(height))
+            return self._tip
+        return json.loads(self.read_raw(height))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for height in range(len(self)):
+            yield self[height]
+
+    # Writes
+
+    def append(self, block: Dict[str, Any]) -> None:
+        """Append a sealed block: write its record, then its index entry"""
+        if self.readonly:
+            raise IOError('block log is open read-only')
+        payload = canonical_json(block)
+        with self.lock:
+            if self._count:
+                segment, offset, length = self._entry(self._count - 1)
+                position = offset + _RECORD.size + length
+                if position >= self.segment_bytes:
+                    segment, position = segment + 1, 0
+            else:
+                segment, position = 0, 0
+
+            with open(self._segment_path(segment), 'ab') as handle:
+                handle.write(_RECORD.pack(len(payload), zlib.crc32(payload)))
+                handle.write(payload)
+                handle.flush()
+                if self.fsync:
+                    os.fsync(handle.fileno())
+            self._write_entry(segment, position, len(payload))
+            self._index_file.flush()
+            if self.fsync:
+                os.fsync(self._index_file.fileno())
+            self._tip = block
+
+    def close(self) -> None:
+        """Close the index map and every open segment"""
+        with self.lock:
+            if self._index_map is not None:
+                self._index_map.close()
+                self._index_map = None
+            self._mapped_count = 0
+            for handle in self._segments.values():
+                handle.close()
+            self._segments.clear()
+            self._index_file.close()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
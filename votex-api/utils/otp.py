@@ -1,5 +1,6 @@
 import random
-from utils.data import update_voter
+from utils.data import get_voter, update_voter, otp_store
+from utils.otp_store import OTP_VALID
 
 def generate_otp():
     """
@@ -10,28 +11,32 @@ def generate_otp():
 def create_otp_for_voter(voter_id):
     """
     Generate and store an OTP for a voter
+    The OTP lives in the OTP store until it is verified, expires or the voter
+    runs out of attempts, so the voter record is only written when it has to
+    change. Returns None while the voter is locked out after too many failed
+    attempts
     """
     otp = generate_otp()
     # In a real application, this would send an SMS
     # For this mock implementation, we just store it
-    update_voter(voter_id, {"otp": otp, "verified": False})
+    if not otp_store.issue(voter_id, otp):
+        return None
+    
+    # A new OTP has to be verified again
+    voter = get_voter(voter_id)
+    if voter and voter.get("verified"):
+        update_voter(voter_id, {"verified": False})
     return otp
 
 def verify_otp(voter_id, provided_otp):
     """
     Verify if the provided OTP matches the stored OTP
+    OTPs expire after VOTEX_OTP_TTL seconds; VOTEX_OTP_MAX_ATTEMPTS failed
+    attempts, counted across reissued OTPs, lock the voter out for
+    VOTEX_OTP_LOCKOUT seconds
     """
-    from utils.data import get_voter
-    
-    voter = get_voter(voter_id)
-    if not voter:
+    if otp_store.verify(voter_id, provided_otp) != OTP_VALID:
         return False
     
-    # Convert both to strings for comparison to avoid type issues
-    stored_otp = voter.get("otp")
-    if stored_otp is not None and str(stored_otp) == str(provided_otp):
-        # Mark as verified if OTP matches
-        update_voter(voter_id, {"verified": True})
-        return True
-    
-    return False 
\ No newline at end of file
+    # Mark as verified if OTP matches
+    return update_voter(voter_id, {"verified": True})
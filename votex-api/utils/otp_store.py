@@ -0,0 +1,224 @@
+import heapq
+import hmac
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+# Outcomes of OTPStore.verify
+OTP_VALID = "valid"
+OTP_INVALID = "invalid"
+OTP_EXPIRED = "expired"
+OTP_MISSING = "missing"
+OTP_LOCKED = "locked"
+
+# Most expired heap items dropped by a single call, so no caller pays for a whole backlog
+SWEEP_BATCH = 256
+
+
+class OTPEntry:
+    """Outstanding OTP of one voter; __slots__ avoids a per-entry dict"""
+    __slots__ = ('code', 'issued_at', 'expires_at')
+
+    def __init__(self, code: str, issued_at: float, expires_at: float):
+        self.code = code
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+
+
+class FailureRecord:
+    """Failed verifications of one voter, kept across reissued OTPs"""
+    __slots__ = ('count', 'expires_at')
+
+    def __init__(self):
+        self.count = 0
+        self.expires_at = 0.0
+
+
+class OTPStore:
+    """
+    Outstanding OTPs keyed by voter_id, kept apart from the voter registry
+    Each OTP expires ttl seconds after it is issued and is consumed by a
+    successful verification. Failed verifications are counted per voter, not
+    per OTP, so requesting a new OTP does not reset them: after max_attempts
+    failures within lockout seconds the outstanding OTP is revoked and the
+    voter can neither verify nor get a new OTP until lockout seconds after
+    the last failure. Expiry times are kept in min-heaps and every call sweeps
+    a bounded batch of expired OTPs and failure records off them. At most
+    max_entries OTPs and max_entries failure records are held; under a flood
+    of requests the ones closest to expiry are evicted first
+    Time Complexity: O(log n) amortized per issue and verify
+    """
+    def __init__(self, ttl: float = 300.0, max_attempts: int = 5, max_entries: int = 100000,
+                 lockout: float = 900.0):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.max_entries = max(1, max_entries)
+        self.lockout = lockout
+        self._entries: Dict[str, OTPEntry] = {}
+        # (expires_at, issued_at, voter_id); a reissued OTP leaves a stale item behind
+        self._expiry: List[Tuple[float, float, str]] = []
+        self._failures: Dict[str, FailureRecord] = {}
+        # (expires_at, voter_id); every failure pushes an item, superseding the voter's earlier ones
+        self._failure_expiry: List[Tuple[float, str]] = []
+        self.lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.issued = 0
+        self.verified = 0
+        self.failed = 0
+        self.expired = 0
+        self.locked_out = 0
+        self.evicted = 0
+        self.refused = 0
+        self.verifications = 0
+
+    def issue(self, voter_id: str, code: Any) -> bool:
+        """
+        Store a new OTP for a voter, replacing any outstanding one
+        Returns False, storing nothing, while the voter is locked out
+        """
+        now = time.monotonic()
+        with self.lock:
+            self._sweep(now)
+            if self._is_locked(voter_id, now):
+                self.refused += 1
+                return False
+            if voter_id not in self._entries:
+                while len(self._entries) >= self.max_entries and self._evict_next():
+                    pass
+            entry = OTPEntry(str(code), now, now + self.ttl)
+            self._entries[voter_id] = entry
+            heapq.heappush(self._expiry, (entry.expires_at, entry.issued_at, voter_id))
+            self.issued += 1
+            # Reissues leave stale heap items; rebuild before they outnumber live ones
+            if len(self._expiry) > 2 * len(self._entries) + 64:
+                self._expiry = [(e.expires_at, e.issued_at, v) for v, e in self._entries.items()]
+                heapq.heapify(self._expiry)
+            return True
+
+    def verify(self, voter_id: str, code: Any) -> str:
+        """
+        Check a voter's OTP, returning one of the OTP_* outcomes
+        A valid OTP is consumed and clears the voter's failures; the failure
+        that reaches max_attempts revokes it and locks the voter out
+        """
+        now = time.monotonic()
+        with self.lock:
+            self._sweep(now)
+            self.verifications += 1
+            entry = self._entries.get(voter_id)
+            if self._is_locked(voter_id, now):
+                outcome = OTP_LOCKED
+            elif entry is None:
+                outcome = OTP_MISSING
+            elif entry.expires_at <= now:
+                del self._entries[voter_id]
+                self.expired += 1
+                outcome = OTP_EXPIRED
+            elif hmac.compare_digest(entry.code.encode(), str(code).encode()):
+                del self._entries[voter_id]
+                self._failures.pop(voter_id, None)
+                self.verified += 1
+                return OTP_VALID
+            elif self._record_failure(voter_id, now) >= self.max_attempts:
+                del self._entries[voter_id]
+                self.locked_out += 1
+                outcome = OTP_LOCKED
+            else:
+                outcome = OTP_INVALID
+            self.failed += 1
+            return outcome
+
+    def discard(self, voter_id: str) -> None:
+        """Revoke a voter's outstanding OTP, if any"""
+        with self.lock:
+            self._entries.pop(voter_id, None)
+
+    def _is_locked(self, voter_id: str, now: float) -> bool:
+        record = self._failures.get(voter_id)
+        return record is not None and record.count >= self.max_attempts and record.expires_at > now
+
+    def _record_failure(self, voter_id: str, now: float) -> int:
+        """Count a failed verification for a voter, returning their failures so far"""
+        record = self._failures.get(voter_id)
+        if record is None or record.expires_at <= now:
+            if record is None:
+                while len(self._failures) >= self.max_entries and self._evict_failure():
+                    pass
+            record = self._failures[voter_id] = FailureRecord()
+        record.count += 1
+        record.expires_at = now + self.lockout
+        heapq.heappush(self._failure_expiry, (record.expires_at, voter_id))
+        # Each failure supersedes the voter's earlier heap items; drop those before they pile up
+        if len(self._failure_expiry) > 2 * len(self._failures) + 64:
+            self._failure_expiry = [(r.expires_at, v) for v, r in self._failures.items()]
+            heapq.heapify(self._failure_expiry)
+        return record.count
+
+    def _is_current_failure(self, item: Tuple[float, str]) -> bool:
+        record = self._failures.get(item[1])
+        return record is not None and record.expires_at == item[0]
+
+    def _evict_failure(self) -> bool:
+        """Drop the failure record closest to expiry, returning whether there was one"""
+        while self._failure_expiry:
+            item = heapq.heappop(self._failure_expiry)
+            if self._is_current_failure(item):
+                del self._failures[item[1]]
+                return True
+        return False
+
+    def _is_current(self, item: Tuple[float, float, str]) -> bool:
+        entry = self._entries.get(item[2])
+        return entry is not None and entry.issued_at == item[1]
+
+    def _sweep(self, now: float) -> None:
+        """Drop up to SWEEP_BATCH each of the OTPs and failure records that have expired by now"""
+        expiry = self._expiry
+        for _ in range(SWEEP_BATCH):
+            if not expiry or expiry[0][0] > now:
+                break
+            item = heapq.heappop(expiry)
+            if self._is_current(item):
+                del self._entries[item[2]]
+                self.expired += 1
+        failure_expiry = self._failure_expiry
+        for _ in range(SWEEP_BATCH):
+            if not failure_expiry or failure_expiry[0][0] > now:
+                break
+            item = heapq.heappop(failure_expiry)
+            if self._is_current_failure(item):
+                del self._failures[item[1]]
+
+    def _evict_next(self) -> bool:
+        """Drop the live OTP closest to expiry, returning whether there was one"""
+        while self._expiry:
+            item = heapq.heappop(self._expiry)
+            if self._is_current(item):
+                del self._entries[item[2]]
+                self.evicted += 1
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            elapsed = max(time.monotonic() - self.started_at, 1e-9)
+            return {
+                "outstanding": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "max_attempts": self.max_attempts,
+                "lockout": self.lockout,
+                "voters_with_failures": len(self._failures),
+                "issued": self.issued,
+                "verified": self.verified,
+                "failed": self.failed,
+                "expired": self.expired,
+                "locked_out": self.locked_out,
+                "evicted": self.evicted,
+                "refused": self.refused,
+                "issued_per_second": self.issued / elapsed,
+                "verifications_per_second": self.verifications / elapsed
+            }
@@ -0,0 +1,46 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of SQLite connections shared between threads
+    Connections run in WAL mode, so readers in other threads and worker
+    processes are not blocked while a write transaction is open
+    """
+    def __init__(self, path: str = ':memory:', size: int = 4, timeout: float = 30.0):
+        self.path = path
+        # Every connection to :memory: opens its own private database
+        self.size = 1 if path == ':memory:' else max(1, size)
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting for one to be returned if all are in use"""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection and commit on success, rolling back on error"""
+        with self.connection() as conn, conn:
+            yield conn
+
+    def close(self) -> None:
+        """Close every connection; the pool cannot be used afterwards"""
+        for _ in range(self.size):
+            self._idle.get().close()
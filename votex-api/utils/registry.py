@@ -0,0 +1,192 @@
+import csv
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from .pool import ConnectionPool
+
+VOTER_FIELDS = ('name', 'phone', 'otp', 'verified')
+
+
+class VoterRegistry(ABC):
+    """
+    Base class of voter registry backends
+    Voters are exposed as plain dicts with name, phone, otp and verified fields;
+    the dicts returned by get are copies, so changes go through update
+    """
+    @abstractmethod
+    def get(self, voter_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, voter_id: str, data: Dict[str, Any]) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_many(self, rows: Iterable[Tuple[str, str, str]]) -> int:
+        """Insert or replace (voter_id, name, phone) rows, returning how many were written"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, voter_id: str) -> bool:
+        return self.get(voter_id) is not None
+
+    def add(self, voter_id: str, name: str, phone: str) -> None:
+        """Register a single voter"""
+        self.add_many([(voter_id, name, phone)])
+
+    def bulk_import_csv(self, path: str, batch_size: int = 50000) -> Dict[str, Any]:
+        """
+        Import an electoral roll from a CSV file with voter_id, name and phone columns
+        Rows are written in batches; returns the row count, duration and rows/sec
+        """
+        started = time.perf_counter()
+        imported = 0
+        with open(path, newline='', encoding='utf-8') as handle:
+            for batch in _batches(csv.DictReader(handle), batch_size):
+                imported += self.add_many((row['voter_id'], row['name'], row['phone']) for row in batch)
+        seconds = time.perf_counter() - started
+        return {
+            'rows': imported,
+            'seconds': seconds,
+            'rows_per_second': imported / seconds if seconds > 0 else 0.0
+        }
+
+
+def _batches(rows: Iterable[Any], size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class VoterRecord:
+    """Compact voter record; __slots__ avoids a per-voter dict"""
+    __slots__ = VOTER_FIELDS
+
+    def __init__(self, name: str, phone: str, otp: Optional[int] = None, verified: bool = False):
+        self.name = name
+        self.phone = phone
+        self.otp = otp
+        self.verified = verified
+
+
+class MemoryVoterRegistry(VoterRegistry):
+    """In-process registry of __slots__ records, for demos and small rolls"""
+    def __init__(self):
+        self._records: Dict[str, VoterRecord] = {}
+        self.lock = threading.Lock()
+
+    def get(self, voter_id: str) -> Optional[Dict[str, Any]]:
+        record = self._records.get(voter_id)
+        if record is None:
+            return None
+        return {field: getattr(record, field) for field in VOTER_FIELDS}
+
+    def update(self, voter_id: str, data: Dict[str, Any]) -> bool:
+        with self.lock:
+            record = self._records.get(voter_id)
+            if record is None:
+                return False
+            for field, value in data.items():
+                if field in VOTER_FIELDS:
+                    setattr(record, field, value)
+            return True
+
+    def add_many(self, rows: Iterable[Tuple[str, str, str]]) -> int:
+        count = 0
+        with self.lock:
+            for voter_id, name, phone in rows:
+                self._records[voter_id] = VoterRecord(name, phone)
+                count += 1
+        return count
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, voter_id: str) -> bool:
+        return voter_id in self._records
+
+
+class SQLiteVoterRegistry(VoterRegistry):
+    """
+    SQLite-backed registry for constituency-scale rolls
+    Voters live in a WITHOUT ROWID table clustered on voter_id, so a lookup is
+    a single B-tree search and memory use does not grow with the roll.
+    Pass pool to share connections with other tables in the same database
+    """
+    def __init__(self, path: str = ':memory:', pool: Optional[ConnectionPool] = None):
+        self.pool = pool or ConnectionPool(path)
+        self.path = self.pool.path
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS voters ("
+                " voter_id TEXT PRIMARY KEY,"
+                " name TEXT NOT NULL,"
+                " phone TEXT NOT NULL,"
+                " otp INTEGER,"
+                " verified INTEGER NOT NULL DEFAULT 0"
+                ") WITHOUT ROWID"
+            )
+
+    def get(self, voter_id: str) -> Optional[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT name, phone, otp, verified FROM voters WHERE voter_id = ?", (voter_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"name": row[0], "phone": row[1], "otp": row[2], "verified": bool(row[3])}
+
+    def update(self, voter_id: str, data: Dict[str, Any]) -> bool:
+        fields = [field for field in data if field in VOTER_FIELDS]
+        if not fields:
+            return voter_id in self
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        values = [data[field] for field in fields]
+        with self.pool.transaction() as conn:
+            cursor = conn.execute(f"UPDATE voters SET {assignments} WHERE voter_id = ?", (*values, voter_id))
+        return cursor.rowcount > 0
+
+    def add_many(self, rows: Iterable[Tuple[str, str, str]]) -> int:
+        rows = list(rows)
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO voters (voter_id, name, phone, otp, verified) VALUES (?, ?, ?, NULL, 0)",
+                rows
+            )
+        return len(rows)
+
+    def __len__(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM voters").fetchone()[0]
+
+    def size_bytes(self) -> int:
+        """Size of the database pages in use"""
+        with self.pool.connection() as conn:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+
+def create_registry(path: Optional[str] = None) -> VoterRegistry:
+    """SQLite registry at path, or an in-memory registry when no path is given"""
+    return SQLiteVoterRegistry(path) if path else MemoryVoterRegistry()
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.registry <voters.db> <roll.csv>
+    if len(sys.argv) != 3:
+        print("Usage: python -m utils.registry <voters.db> <roll.csv>")
+        sys.exit(1)
+    stats = SQLiteVoterRegistry(sys.argv[1]).bulk_import_csv(sys.argv[2])
+    print(f"Imported {stats['rows']} voters in {stats['seconds']:.2f}s ({stats['rows_per_second']:.0f} rows/sec)")
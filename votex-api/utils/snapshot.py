@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+SNAPSHOT_PATTERN = 'snapshot-{:012d}.json'
+
+
+class SnapshotStore:
+    """
+    Periodic snapshots of state derived from the chain
+    A snapshot records the chain height and tip it was taken at, so startup can
+    load it and replay only the blocks sealed afterwards. save_in_background
+    serializes and fsyncs on a separate thread, so the caller only pays for
+    copying the state
+    """
+    def __init__(self, directory: str, interval_blocks: int = 100, keep: int = 2):
+        self.directory = directory
+        self.interval_blocks = max(1, interval_blocks)
+        self.keep = max(1, keep)
+        os.makedirs(directory, exist_ok=True)
+        self._writer: Optional[threading.Thread] = None
+        self.last_write_seconds: Optional[float] = None
+
+    def is_due(self, height: int, last_height: int) -> bool:
+        """Whether a snapshot should be taken at this chain height"""
+        return height - last_height >= self.interval_blocks
+
+    def _paths(self) -> List[str]:
+        """Snapshot files, newest first"""
+        names = sorted(
+            (name for name in os.listdir(self.directory)
+             if name.startswith('snapshot-') and name.endswith('.json')),
+            reverse=True
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def save(self, state: Dict[str, Any]) -> str:
+        """
+        Atomically write a snapshot of the state at state['height']
+        Values that are callables are called and their results written.
+        Older snapshots beyond the retention count are removed
+        """
+        state = {key: value() if callable(value) else value for key, value in state.items()}
+        state['created_at'] = time.time()
+        path = os.path.join(self.directory, SNAPSHOT_PATTERN.format(state['height']))
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump(state, handle, separators=(',', ':'), default=_encode_set)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+
+        for old_path in self._paths()[self.keep:]:
+            os.remove(old_path)
+        return path
+
+    def save_in_background(self, state: Dict[str, Any]) -> bool:
+        """
+        Write a snapshot with save on a background thread
+        Callable values are called on that thread, so slow reads can be
+        deferred too. Returns False, writing nothing, while the previous
+        snapshot is still being written
+        """
+        if self._writer is not None and self._writer.is_alive():
+            return False
+        self._writer = threading.Thread(target=self._write, args=(state,), name="snapshot-writer", daemon=True)
+        self._writer.start()
+        return True
+
+    def wait(self) -> None:
+        """Block until the snapshot being written in the background, if any, is on disk"""
+        if self._writer is not None:
+            self._writer.join()
+
+    def _write(self, state: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        try:
+            self.save(state)
+        except Exception as exc:
+            print(f"Warning: Snapshot at height {state.get('height')} failed: {exc}")
+            return
+        self.last_write_seconds = time.perf_counter() - started
+
+    def load_latest(self) -> Optional[Dict[str, Any]]:
+        """Load the newest readable snapshot, or None if there is none"""
+        for path in self._paths():
+            try:
+                with open(path, encoding='utf-8') as handle:
+                    return json.load(handle)
+            except (OSError, ValueError):
+                continue
+        return None
+
+
+def _encode_set(value: Any) -> List[Any]:
+    """Write sets, such as copied spent-voter sets, as sorted lists"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,73 @@
+import threading
+from typing import Any, Dict, List, Set
+
+
+class SpentVoterIndex:
+    """
+    Per-election sets of voters who have already voted
+    Duplicate checks are O(1) and independent across elections
+    """
+    def __init__(self):
+        self.spent: Dict[int, Set[str]] = {}
+        self.lock = threading.RLock()
+
+    def contains(self, election_id: int, voter_id: str) -> bool:
+        """Whether a voter has already voted in an election"""
+        return voter_id in self.spent.get(election_id, ())
+
+    def add(self, election_id: int, voter_id: str) -> bool:
+        """Mark a voter as having voted; returns False if they already had"""
+        with self.lock:
+            election_spent = self.spent.setdefault(election_id, set())
+            if voter_id in election_spent:
+                return False
+            election_spent.add(voter_id)
+            return True
+
+    def discard(self, election_id: int, voter_id: str) -> None:
+        """Unmark a voter whose vote was not recorded after all"""
+        with self.lock:
+            self.spent.get(election_id, set()).discard(voter_id)
+
+    def elections_for(self, voter_id: str) -> List[int]:
+        """Elections a voter has voted in"""
+        return sorted(election_id for election_id, voters in self.spent.items() if voter_id in voters)
+
+    def apply_block(self, block: Dict[str, Any]) -> None:
+        """Mark the voters of a sealed block as spent"""
+        for tx in block.get('transactions', []):
+            if 'voter_id' in tx and 'election_id' in tx:
+                self.add(tx['election_id'], tx['voter_id'])
+
+    def rebuild(self, chain) -> None:
+        """Rebuild the sets from every vote on the chain"""
+        with self.lock:
+            self.clear()
+            for block_idx in range(1, len(chain)):
+                self.apply_block(chain[block_idx])
+
+    def clear(self) -> None:
+        with self.lock:
+            self.spent = {}
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """JSON-friendly copy of the sets, for snapshots"""
+        with self.lock:
+            return {str(election_id): sorted(voters) for election_id, voters in self.spent.items()}
+
+    def copy_sets(self) -> Dict[str, Set[str]]:
+        """
+        Unsorted copy of the sets, keyed like to_dict
+        Copying a set is much cheaper than sorting it, so a snapshot can take
+        the copy on the writer thread and sort it in the background
+        """
+        with self.lock:
+            return {str(election_id): set(voters) for election_id, voters in self.spent.items()}
+
+    def load(self, data: Dict[str, List[str]]) -> None:
+        """Restore sets saved by to_dict"""
+        with self.lock:
+            self.clear()
+            for election_id, voters in data.items():
+                for voter_id in voters:
+                    self.add(int(election_id), voter_id)
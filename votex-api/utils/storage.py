@@ -0,0 +1,359 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .pool import ConnectionPool
+from .registry import MemoryVoterRegistry, SQLiteVoterRegistry, VoterRegistry
+
+ELECTION_FIELDS = ('id', 'title', 'description', 'start_date', 'end_date', 'status')
+CANDIDATE_FIELDS = ('id', 'name', 'party', 'bio')
+
+
+class Storage(ABC):
+    """
+    Base class of storage backends for elections, candidates, voters and votes
+    Records are exposed as plain dicts and voters live in a VoterRegistry.
+    A vote is claimed atomically when it is accepted, so processes sharing the
+    storage cannot both accept the same voter for an election, and written
+    again in a batch when its block is sealed. Until then the claim is pending
+    under an owner naming the chain it waits for, so claims left behind by a
+    crash can be released at startup; get_vote returns the voter's most
+    recently recorded vote. metadata_version counts the election and
+    candidate changes made through this instance
+    """
+    voters: VoterRegistry
+    metadata_version: int = 0
+    metadata_changed_at: float = 0.0
+
+    def _metadata_changed(self) -> None:
+        self.metadata_version += 1
+        self.metadata_changed_at = time.time()
+
+    @abstractmethod
+    def get_elections(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_election(self, election_id: int) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_candidates(self, election_id: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_candidate(self, election_id: int, candidate_id: int) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_election(self, election: Dict[str, Any], candidates: Iterable[Dict[str, Any]] = ()) -> None:
+        """Insert or replace an election together with its candidates"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim_votes(self, rows: Iterable[Tuple[str, int, int]], owner: str = '') -> List[bool]:
+        """
+        Record (voter_id, election_id, candidate_id) rows that are not recorded yet
+        as claims pending under owner
+        Returns, per row, False if the voter already had a vote in that election
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def release_votes(self, keys: Iterable[Tuple[str, int]]) -> None:
+        """Drop the pending claims of (voter_id, election_id) votes that will not reach the chain"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def release_pending_votes(self, owner: str, before: float) -> int:
+        """
+        Drop every claim of owner made before a time and still pending, e.g. the
+        claims of votes lost in a crash before their block was sealed
+        Returns how many claims were released
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_votes(self, rows: Iterable[Tuple[str, int, int]]) -> int:
+        """
+        Record (voter_id, election_id, candidate_id) rows in one batch, confirming
+        their claims, and return how many were written
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_vote(self, voter_id: str) -> Optional[Dict[str, int]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def has_voted(self, voter_id: str, election_id: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def latest_votes(self) -> Dict[str, Dict[str, int]]:
+        """Every voter's most recent vote, keyed by voter_id"""
+        raise NotImplementedError
+
+
+class MemoryStorage(Storage):
+    """In-process storage for demos and tests; state is lost on restart"""
+    def __init__(self):
+        self.elections: Dict[int, Dict[str, Any]] = {}
+        self.candidates: Dict[int, List[Dict[str, Any]]] = {}
+        self.candidate_index: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self.votes: Dict[str, Dict[int, int]] = {}
+        # (voter_id, election_id) -> (owner, claimed_at) of claims not yet on the chain
+        self.pending: Dict[Tuple[str, int], Tuple[str, float]] = {}
+        self.voters = MemoryVoterRegistry()
+        self.lock = threading.Lock()
+
+    def get_elections(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [election for election in self.elections.values() if status is None or election["status"] == status]
+
+    def get_election(self, election_id: int) -> Optional[Dict[str, Any]]:
+        return self.elections.get(election_id)
+
+    def get_candidates(self, election_id: int) -> List[Dict[str, Any]]:
+        return self.candidates.get(election_id, [])
+
+    def get_candidate(self, election_id: int, candidate_id: int) -> Optional[Dict[str, Any]]:
+        return self.candidate_index.get((election_id, candidate_id))
+
+    def add_election(self, election: Dict[str, Any], candidates: Iterable[Dict[str, Any]] = ()) -> None:
+        election_id = election["id"]
+        for candidate in self.candidates.pop(election_id, []):
+            del self.candidate_index[(election_id, candidate["id"])]
+        self.elections[election_id] = dict(election)
+        self.candidates[election_id] = [dict(candidate) for candidate in candidates]
+        for candidate in self.candidates[election_id]:
+            self.candidate_index[(election_id, candidate["id"])] = candidate
+        self._metadata_changed()
+
+    def claim_votes(self, rows: Iterable[Tuple[str, int, int]], owner: str = '') -> List[bool]:
+        claimed = []
+        now = time.time()
+        with self.lock:
+            for voter_id, election_id, candidate_id in rows:
+                voter_votes = self.votes.setdefault(voter_id, {})
+                if election_id in voter_votes:
+                    claimed.append(False)
+                    continue
+                voter_votes[election_id] = candidate_id
+                self.pending[(voter_id, election_id)] = (owner, now)
+                claimed.append(True)
+        return claimed
+
+    def release_votes(self, keys: Iterable[Tuple[str, int]]) -> None:
+        with self.lock:
+            for voter_id, election_id in keys:
+                if self.pending.pop((voter_id, election_id), None) is None:
+                    continue
+                voter_votes = self.votes.get(voter_id)
+                if voter_votes is not None:
+                    voter_votes.pop(election_id, None)
+                    if not voter_votes:
+                        del self.votes[voter_id]
+
+    def release_pending_votes(self, owner: str, before: float) -> int:
+        with self.lock:
+            keys = [key for key, (claim_owner, claimed_at) in self.pending.items()
+                    if claim_owner == owner and claimed_at < before]
+        self.release_votes(keys)
+        return len(keys)
+
+    def record_votes(self, rows: Iterable[Tuple[str, int, int]]) -> int:
+        count = 0
+        for voter_id, election_id, candidate_id in rows:
+            self.pending.pop((voter_id, election_id), None)
+            voter_votes = self.votes.setdefault(voter_id, {})
+            # Re-inserting moves the election to the end, so the last item is the latest vote
+            voter_votes.pop(election_id, None)
+            voter_votes[election_id] = candidate_id
+            count += 1
+        return count
+
+    def get_vote(self, voter_id: str) -> Optional[Dict[str, int]]:
+        voter_votes = self.votes.get(voter_id)
+        if not voter_votes:
+            return None
+        election_id, candidate_id = next(reversed(voter_votes.items()))
+        return {"election_id": election_id, "candidate_id": candidate_id}
+
+    def has_voted(self, voter_id: str, election_id: int) -> bool:
+        return election_id in self.votes.get(voter_id, ())
+
+    def latest_votes(self) -> Dict[str, Dict[str, int]]:
+        return {voter_id: self.get_vote(voter_id) for voter_id in list(self.votes)}
+
+
+class SQLiteStorage(Storage):
+    """
+    SQLite storage shared by every worker process pointed at the same file
+    Connections come from a pool, and each batch of votes is written in a
+    single transaction
+    """
+    def __init__(self, path: str = ':memory:', pool_size: int = 4):
+        self.pool = ConnectionPool(path, size=pool_size)
+        self.path = path
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS elections ("
+                " id INTEGER PRIMARY KEY,"
+                " title TEXT NOT NULL,"
+                " description TEXT,"
+                " start_date TEXT,"
+                " end_date TEXT,"
+                " status TEXT NOT NULL"
+                ")"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                " election_id INTEGER NOT NULL,"
+                " id INTEGER NOT NULL,"
+                " name TEXT NOT NULL,"
+                " party TEXT,"
+                " bio TEXT,"
+                " PRIMARY KEY (election_id, id)"
+                ") WITHOUT ROWID"
+            )
+            # The rowid orders votes, so a voter's latest vote is the one with the highest rowid
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS votes ("
+                " voter_id TEXT NOT NULL,"
+                " election_id INTEGER NOT NULL,"
+                " candidate_id INTEGER NOT NULL,"
+                " PRIMARY KEY (voter_id, election_id)"
+                ")"
+            )
+            # Claims of votes whose blocks are not sealed yet; a row here marks its vote as pending
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS vote_claims ("
+                " voter_id TEXT NOT NULL,"
+                " election_id INTEGER NOT NULL,"
+                " owner TEXT NOT NULL,"
+                " claimed_at REAL NOT NULL,"
+                " PRIMARY KEY (voter_id, election_id)"
+                ") WITHOUT ROWID"
+            )
+        self.voters = SQLiteVoterRegistry(pool=self.pool)
+        # Changes made by other processes are not tracked, so date the data to startup
+        self.metadata_changed_at = time.time()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def get_elections(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        columns = ", ".join(ELECTION_FIELDS)
+        if status is None:
+            rows = self._query(f"SELECT {columns} FROM elections ORDER BY id")
+        else:
+            rows = self._query(f"SELECT {columns} FROM elections WHERE status = ? ORDER BY id", (status,))
+        return [dict(zip(ELECTION_FIELDS, row)) for row in rows]
+
+    def get_election(self, election_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._query(f"SELECT {', '.join(ELECTION_FIELDS)} FROM elections WHERE id = ?", (election_id,))
+        return dict(zip(ELECTION_FIELDS, rows[0])) if rows else None
+
+    def get_candidates(self, election_id: int) -> List[Dict[str, Any]]:
+        rows = self._query(
+            f"SELECT {', '.join(CANDIDATE_FIELDS)} FROM candidates WHERE election_id = ? ORDER BY id", (election_id,)
+        )
+        return [dict(zip(CANDIDATE_FIELDS, row)) for row in rows]
+
+    def get_candidate(self, election_id: int, candidate_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._query(
+            f"SELECT {', '.join(CANDIDATE_FIELDS)} FROM candidates WHERE election_id = ? AND id = ?",
+            (election_id, candidate_id)
+        )
+        return dict(zip(CANDIDATE_FIELDS, rows[0])) if rows else None
+
+    def add_election(self, election: Dict[str, Any], candidates: Iterable[Dict[str, Any]] = ()) -> None:
+        with self.pool.transaction() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO elections ({', '.join(ELECTION_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                tuple(election.get(field) for field in ELECTION_FIELDS)
+            )
+            conn.execute("DELETE FROM candidates WHERE election_id = ?", (election["id"],))
+            conn.executemany(
+                "INSERT INTO candidates (election_id, id, name, party, bio) VALUES (?, ?, ?, ?, ?)",
+                [(election["id"], *(candidate.get(field) for field in CANDIDATE_FIELDS)) for candidate in candidates]
+            )
+        self._metadata_changed()
+
+    def claim_votes(self, rows: Iterable[Tuple[str, int, int]], owner: str = '') -> List[bool]:
+        # A plain insert either takes the (voter_id, election_id) key or leaves the existing vote alone
+        claimed = []
+        now = time.time()
+        with self.pool.transaction() as conn:
+            for voter_id, election_id, candidate_id in rows:
+                taken = conn.execute(
+                    "INSERT OR IGNORE INTO votes (voter_id, election_id, candidate_id) VALUES (?, ?, ?)",
+                    (voter_id, election_id, candidate_id)
+                ).rowcount == 1
+                if taken:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO vote_claims (voter_id, election_id, owner, claimed_at) VALUES (?, ?, ?, ?)",
+                        (voter_id, election_id, owner, now)
+                    )
+                claimed.append(taken)
+        return claimed
+
+    def release_votes(self, keys: Iterable[Tuple[str, int]]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        with self.pool.transaction() as conn:
+            self._release(conn, keys)
+
+    @staticmethod
+    def _release(conn, keys: List[Tuple[str, int]]) -> None:
+        # Only pending claims are dropped; a vote confirmed by a sealed block stays
+        for key in keys:
+            if conn.execute("DELETE FROM vote_claims WHERE voter_id = ? AND election_id = ?", key).rowcount:
+                conn.execute("DELETE FROM votes WHERE voter_id = ? AND election_id = ?", key)
+
+    def release_pending_votes(self, owner: str, before: float) -> int:
+        with self.pool.transaction() as conn:
+            keys = conn.execute(
+                "SELECT voter_id, election_id FROM vote_claims WHERE owner = ? AND claimed_at < ?", (owner, before)
+            ).fetchall()
+            self._release(conn, keys)
+        return len(keys)
+
+    def record_votes(self, rows: Iterable[Tuple[str, int, int]]) -> int:
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO votes (voter_id, election_id, candidate_id) VALUES (?, ?, ?)", rows
+            )
+            conn.executemany(
+                "DELETE FROM vote_claims WHERE voter_id = ? AND election_id = ?", [row[:2] for row in rows]
+            )
+        return len(rows)
+
+    def get_vote(self, voter_id: str) -> Optional[Dict[str, int]]:
+        rows = self._query(
+            "SELECT election_id, candidate_id FROM votes WHERE voter_id = ? ORDER BY rowid DESC LIMIT 1", (voter_id,)
+        )
+        return {"election_id": rows[0][0], "candidate_id": rows[0][1]} if rows else None
+
+    def has_voted(self, voter_id: str, election_id: int) -> bool:
+        return bool(self._query(
+            "SELECT 1 FROM votes WHERE voter_id = ? AND election_id = ?", (voter_id, election_id)
+        ))
+
+    def latest_votes(self) -> Dict[str, Dict[str, int]]:
+        latest = {}
+        for voter_id, election_id, candidate_id in self._query(
+                "SELECT voter_id, election_id, candidate_id FROM votes ORDER BY rowid"):
+            latest[voter_id] = {"election_id": election_id, "candidate_id": candidate_id}
+        return latest
+
+
+def create_storage(path: Optional[str] = None) -> Storage:
+    """SQLite storage at path, or in-memory storage when no path is given"""
+    return SQLiteStorage(path) if path else MemoryStorage()
@@ -0,0 +1,23 @@
+import zlib
+from typing import Iterable, Iterator
+
+# Emit compressed output once this much input has been fed to the compressor
+GZIP_FLUSH_BYTES = 64 * 1024
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip-compress a stream of byte chunks incrementally
+    Memory use is bounded by the compressor window, not the stream length
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+    pending = 0
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        pending += len(chunk)
+        if pending >= GZIP_FLUSH_BYTES:
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if data:
+            yield data
+    yield compressor.flush()
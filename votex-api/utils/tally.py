@@ -0,0 +1,110 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class TallyEngine:
+    """
+    Real-time per-election, per-candidate vote counters
+    Counters are updated as blocks are sealed and can be rebuilt from, or
+    checked against, a full recount of the chain
+    Time Complexity: O(1) per election lookup, O(transactions) per block applied
+    """
+    def __init__(self):
+        self.counts: Dict[int, Dict[int, int]] = {}
+        self.totals: Dict[int, int] = {}
+        self.height = 0  # highest block counted
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def _count_block(block: Dict[str, Any], counts: Dict[int, Dict[int, int]], totals: Dict[int, int]) -> None:
+        for tx in block.get('transactions', []):
+            if not all(k in tx for k in ['voter_id', 'election_id', 'candidate_id']):
+                continue
+            election_counts = counts.setdefault(tx['election_id'], {})
+            election_counts[tx['candidate_id']] = election_counts.get(tx['candidate_id'], 0) + 1
+            totals[tx['election_id']] = totals.get(tx['election_id'], 0) + 1
+
+    def apply_block(self, block: Dict[str, Any]) -> bool:
+        """
+        Count the votes of a newly sealed block
+        Blocks at or below the counted height are ignored, so a block is never
+        counted twice
+        """
+        with self.lock:
+            if block['index'] <= self.height:
+                return False
+            self._count_block(block, self.counts, self.totals)
+            self.height = block['index']
+            return True
+
+    def recount(self, chain, height: Optional[int] = None) -> Dict[int, Dict[int, int]]:
+        """Count every vote in the chain up to a height from scratch"""
+        height = len(chain) - 1 if height is None else height
+        counts, totals = {}, {}
+        for block_idx in range(1, height + 1):
+            self._count_block(chain[block_idx], counts, totals)
+        return counts
+
+    def rebuild(self, chain) -> None:
+        """Replace the counters with a full recount of the chain"""
+        with self.lock:
+            height = len(chain) - 1
+            self.counts = self.recount(chain, height)
+            self.totals = {election_id: sum(counts.values()) for election_id, counts in self.counts.items()}
+            self.height = height
+
+    def results(self, election_id: int) -> Dict[str, Any]:
+        """Current counters for one election"""
+        with self.lock:
+            return {
+                'election_id': election_id,
+                'total_votes': self.totals.get(election_id, 0),
+                'counts': dict(self.counts.get(election_id, {})),
+                'height': self.height
+            }
+
+    def total(self, election_id: int) -> int:
+        """Number of votes counted for an election"""
+        return self.totals.get(election_id, 0)
+
+    def total_votes(self) -> int:
+        """Number of votes counted across all elections"""
+        return sum(self.totals.values())
+
+    def check_consistency(self, chain) -> Dict[str, Any]:
+        """
+        Compare the counters with a recount of the chain up to the counted height
+        Returns whether they match and every (election, candidate) that differs
+        """
+        with self.lock:
+            height = self.height
+            counts = {election_id: dict(c) for election_id, c in self.counts.items()}
+        recount = self.recount(chain, height)
+
+        mismatches: List[Dict[str, Any]] = []
+        for election_id in sorted(set(counts) | set(recount)):
+            live, fresh = counts.get(election_id, {}), recount.get(election_id, {})
+            for candidate_id in sorted(set(live) | set(fresh)):
+                if live.get(candidate_id, 0) != fresh.get(candidate_id, 0):
+                    mismatches.append({
+                        'election_id': election_id,
+                        'candidate_id': candidate_id,
+                        'counted': live.get(candidate_id, 0),
+                        'recounted': fresh.get(candidate_id, 0)
+                    })
+        return {'consistent': not mismatches, 'height': height, 'mismatches': mismatches}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly copy of the counters, for snapshots"""
+        with self.lock:
+            return {
+                'height': self.height,
+                'counts': {str(e): {str(c): n for c, n in counts.items()} for e, counts in self.counts.items()}
+            }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Restore counters saved by to_dict"""
+        with self.lock:
+            self.counts = {int(e): {int(c): n for c, n in counts.items()} for e, counts in data['counts'].items()}
+            self.totals = {election_id: sum(counts.values()) for election_id, counts in self.counts.items()}
+            self.height = data['height']
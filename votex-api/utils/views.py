@@ -0,0 +1,124 @@
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class VoteView:
+    """
+    Materialized view of the enriched votes on the chain
+    Votes are appended block by block as blocks are sealed, so reads serve the
+    stored list instead of walking the chain. The view always covers a prefix of
+    the chain: blocks it has not seen yet (e.g. after a snapshot restore) are
+    caught up in one pass on the next sync
+    """
+    def __init__(self, format_vote: Callable[[Dict[str, Any], int, Dict[str, Any], int], Dict[str, Any]]):
+        self.format_vote = format_vote
+        self.votes: List[Dict[str, Any]] = []
+        self.height = 0  # highest block applied to the view
+        self.lock = threading.RLock()
+        # Sorted (block_index, tx_index) keys parallel to votes, for cursor seeks
+        self.keys: List[Tuple[int, int]] = []
+        # Per-election vote positions and their keys
+        self.election_positions: Dict[int, List[int]] = {}
+        self.election_keys: Dict[int, List[Tuple[int, int]]] = {}
+        # Heights and timestamps of applied blocks, for time range filters
+        self.block_heights: List[int] = []
+        self.block_times: List[float] = []
+
+    def apply_block(self, block: Dict[str, Any]) -> bool:
+        """
+        Append the votes of the next block to the view
+        Returns False (and applies nothing) if the block does not directly
+        follow the view's height
+        """
+        with self.lock:
+            if block['index'] != self.height + 1:
+                return False
+            for tx_idx, tx in enumerate(block.get('transactions', [])):
+                if all(k in tx for k in ['voter_id', 'election_id', 'candidate_id']):
+                    key = (block['index'], tx_idx)
+                    self.election_positions.setdefault(tx['election_id'], []).append(len(self.votes))
+                    self.election_keys.setdefault(tx['election_id'], []).append(key)
+                    self.keys.append(key)
+                    self.votes.append(self.format_vote(block, block['index'], tx, tx_idx))
+            self.block_heights.append(block['index'])
+            self.block_times.append(block['timestamp'])
+            self.height = block['index']
+            return True
+
+    def sync(self, chain) -> List[Dict[str, Any]]:
+        """
+        Catch the view up with the chain and return the vote list
+        Time Complexity: O(blocks sealed since the last sync)
+        """
+        with self.lock:
+            for block_idx in range(self.height + 1, len(chain)):
+                self.apply_block(chain[block_idx])
+            return self.votes
+
+    def sync_snapshot(self, chain) -> Tuple[List[Dict[str, Any]], int, int]:
+        """
+        Catch the view up with the chain and return the vote list together
+        with its length and the view's height, all read under the same lock
+        The list keeps growing as blocks are sealed; its first count votes
+        are exactly the votes of blocks up to height
+        """
+        with self.lock:
+            votes = self.sync(chain)
+            return votes, len(votes), self.height
+
+    def page(self, after: Optional[Tuple[int, int]] = None, limit: int = 100,
+             election_id: Optional[int] = None, from_block: Optional[int] = None,
+             to_block: Optional[int] = None, since: Optional[float] = None,
+             until: Optional[float] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[int, int]]]:
+        """
+        One page of votes ordered by (block_index, tx_index)
+        after is the cursor key of the last vote already seen. Time bounds are
+        applied to block timestamps. Returns the page and the cursor for the
+        next page (None when there are no more votes)
+        Time Complexity: O(log n + limit)
+        """
+        with self.lock:
+            # Translate the time range into a block range
+            if since is not None:
+                position = bisect_left(self.block_times, since)
+                first = self.block_heights[position] if position < len(self.block_heights) else self.height + 1
+                from_block = first if from_block is None else max(from_block, first)
+            if until is not None:
+                position = bisect_right(self.block_times, until)
+                last = self.block_heights[position - 1] if position else 0
+                to_block = last if to_block is None else min(to_block, last)
+
+            if election_id is None:
+                keys, positions = self.keys, None
+            else:
+                keys = self.election_keys.get(election_id, [])
+                positions = self.election_positions.get(election_id, [])
+
+            start = 0
+            if after is not None:
+                start = bisect_right(keys, after)
+            if from_block is not None:
+                start = max(start, bisect_left(keys, (from_block, -1)))
+            stop = len(keys)
+            if to_block is not None:
+                stop = min(stop, bisect_left(keys, (to_block + 1, -1)))
+
+            end = min(stop, start + limit)
+            if positions is None:
+                items = self.votes[start:end]
+            else:
+                items = [self.votes[position] for position in positions[start:end]]
+            next_key = keys[end - 1] if end < stop and end > start else None
+            return items, next_key
+
+    def clear(self) -> None:
+        """Empty the view so it is rebuilt from genesis on the next sync"""
+        with self.lock:
+            self.votes = []
+            self.keys = []
+            self.election_positions = {}
+            self.election_keys = {}
+            self.block_heights = []
+            self.block_times = []
+            self.height = 0